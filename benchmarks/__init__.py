@@ -0,0 +1,14 @@
+"""
+Benchmarks for the hot paths of django-configurations.
+
+Run them from the repository root with::
+
+    python -m benchmarks [-k PATTERN]
+
+To catch performance regressions, save the results on one commit and
+compare them with the results on another, which exits with an error if
+any benchmark got more than ``--threshold`` times slower::
+
+    git checkout main && python -m benchmarks --save main.json
+    git checkout feature && python -m benchmarks --compare main.json
+"""
@@ -0,0 +1,78 @@
+import argparse
+import importlib
+import json
+import pkgutil
+import platform
+import sys
+
+import django
+
+from . import __path__, harness
+
+
+def format_time(seconds):
+    for unit, factor in (('s', 1), ('ms', 1e3), ('us', 1e6)):
+        if seconds * factor >= 1:
+            return f'{seconds * factor:.2f} {unit}'
+    return f'{seconds * 1e9:.0f} ns'
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='python -m benchmarks')
+    parser.add_argument('-k', dest='pattern', default='',
+                        help='only run benchmarks containing this string')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--save', metavar='FILE',
+                        help='write the results to a JSON file')
+    parser.add_argument('--compare', metavar='FILE',
+                        help='compare the results with a JSON file written '
+                             'by --save, e.g. on another commit')
+    parser.add_argument('--threshold', type=float, default=1.2,
+                        help='the slowdown compared to the --compare '
+                             'results reported as a regression '
+                             '(default: %(default)s)')
+    args = parser.parse_args()
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare) as fp:
+            baseline = json.load(fp)['results']
+
+    harness.setup_environment()
+    for module in pkgutil.iter_modules(__path__):
+        if module.name.startswith('bench_'):
+            importlib.import_module(f'{__package__}.{module.name}')
+
+    results = {}
+    regressions = []
+    for bench in harness.registry:
+        for params in bench.cases():
+            label = bench.name + ''.join(f' {key}={value}'
+                                         for key, value in params.items())
+            if args.pattern not in label:
+                continue
+            seconds = results[label] = bench.run(repeat=args.repeat, **params)
+            line = f'{label:<70} {format_time(seconds):>12}'
+            if label in baseline:
+                ratio = seconds / baseline[label]
+                line += f' {ratio:>8.2f}x'
+                if ratio > args.threshold:
+                    regressions.append(label)
+                    line += ' slower'
+            print(line)
+
+    if args.save:
+        with open(args.save, 'w') as fp:
+            json.dump({
+                'python': platform.python_version(),
+                'django': django.__version__,
+                'results': results,
+            }, fp, indent=2, sort_keys=True)
+    if regressions:
+        print(f'{len(regressions)} benchmark(s) more than {args.threshold}x '
+              f'slower than {args.compare}', file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+import os
+import tempfile
+from unittest import mock
+
+from configurations import dotenv
+
+from .harness import benchmark, enter
+
+
+def content(lines):
+    """
+    A ``.env`` file with the given number of lines, mixing comments,
+    quoted, unquoted and multiline values.
+    """
+    parts = []
+    for number in range(lines // 5):
+        parts.append(f'# comment {number}')
+        parts.append(f'export PLAIN_{number}=value-{number}')
+        parts.append(f"SINGLE_{number}='single quoted {number}'")
+        parts.append(f'DOUBLE_{number}="double \\"quoted\\" {number}"')
+        parts.append(f'MULTI_{number}="first\nsecond"')
+    return '\n'.join(parts) + '\n'
+
+
+@benchmark(lines=[100, 1000, 10000])
+def parse(lines):
+    text = content(lines)
+    return lambda: dotenv.parse(text)
+
+
+@benchmark(lines=[10000], cached=[False, True])
+def read(lines, cached):
+    directory = enter(tempfile.TemporaryDirectory())
+    path = os.path.join(directory, '.env')
+    with open(path, 'w') as fp:
+        fp.write(content(lines))
+    environ = {'DJANGO_CONFIGURATION_CACHE': os.path.join(directory, 'cache')}
+    if not cached:
+        environ = {}
+
+    def read():
+        dotenv._files.clear()
+        with mock.patch.dict(os.environ, environ):
+            dotenv.read(path)
+    return read
+
+
+@benchmark(files=[1, 5, 20], cached=[False, True])
+def read_files(files, cached):
+    directory = enter(tempfile.TemporaryDirectory())
+    paths = []
+    for number in range(files):
+        paths.append(os.path.join(directory, f'.env.{number}'))
+        with open(paths[-1], 'w') as fp:
+            fp.write(content(200))
+
+    def read_files():
+        if not cached:
+            dotenv._files.clear()
+            dotenv._merged.clear()
+        dotenv.read_files(paths)
+    return read_files
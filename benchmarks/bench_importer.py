@@ -0,0 +1,199 @@
+import importlib
+import itertools
+import os
+import sys
+import tempfile
+import types
+from importlib import import_module
+from unittest import mock
+
+from configurations import dotenv, importer
+
+from .harness import benchmark, enter
+
+module_name = f'{__package__}.settings'
+
+
+@benchmark(configuration=['Bench', 'LazyBench'], cached=[False, True])
+def import_settings(configuration, cached):
+    """
+    Imports the settings module through the ``ConfigurationFinder``.
+    """
+    environ = {
+        'DJANGO_SETTINGS_MODULE': module_name,
+        'DJANGO_CONFIGURATION': configuration,
+        'DJANGO_CONFIGURATION_CACHE': (
+            enter(tempfile.TemporaryDirectory()) if cached else ''),
+    }
+
+    def import_settings():
+        sys.modules.pop(module_name, None)
+        with mock.patch.dict(os.environ, environ):
+            import_module(module_name)
+    return import_settings
+
+
+@benchmark()
+def reload_settings():
+    """
+    Reloads the settings module with ``importlib.reload``.
+    """
+    environ = {
+        'DJANGO_SETTINGS_MODULE': module_name,
+        'DJANGO_CONFIGURATION': 'Bench',
+        'DJANGO_CONFIGURATION_CACHE': '',
+    }
+    with mock.patch.dict(os.environ, environ):
+        sys.modules.pop(module_name, None)
+        module = import_module(module_name)
+
+    def reload_settings():
+        with mock.patch.dict(os.environ, environ):
+            importlib.reload(module)
+    return reload_settings
+
+
+@benchmark(changed=[False, True])
+def refresh(changed):
+    """
+    Refreshes the settings after importing them, with or without a
+    changed environment variable, compared with ``reload_settings``.
+    """
+    environ = {
+        'DJANGO_SETTINGS_MODULE': module_name,
+        'DJANGO_CONFIGURATION': 'Bench',
+        'DJANGO_CONFIGURATION_CACHE': '',
+    }
+    with mock.patch.dict(os.environ, environ):
+        sys.modules.pop(module_name, None)
+        module = import_module(module_name)
+    counter = itertools.count()
+
+    def refresh():
+        with mock.patch.dict(os.environ, environ):
+            if changed:
+                os.environ['DJANGO_SITE_URL'] = (
+                    f'https://{next(counter)}.example.com/')
+            module.Bench.refresh()
+    return refresh
+
+
+@benchmark(settings=[10, 100], memoize=[False, True])
+def computed_settings(settings, memoize):
+    """
+    Sets up a chain of properties that each use the previous one, like
+    ``STATIC_ROOT`` using ``BASE_DIR``, optionally with ``MEMOIZE_COMPUTED``.
+    """
+    from configurations import Configuration
+
+    def chained(number):
+        return property(lambda self: getattr(self, f'SETTING_{number - 1}'))
+
+    attrs = {f'SETTING_{number}': chained(number)
+             for number in range(1, settings)}
+    attrs['SETTING_0'] = 'base'
+    attrs['MEMOIZE_COMPUTED'] = memoize
+    cls = type(Configuration)('Computed', (Configuration,), {
+        '__module__': __name__, **attrs})
+    module = types.ModuleType('computed')
+
+    def computed_settings():
+        obj = cls()
+        for name in attrs:
+            importer.setup_setting(module, obj, name)
+    return computed_settings
+
+
+@benchmark(setting=['attribute', 'property'])
+def read_setting(setting):
+    """
+    Reads a setting of a configuration instance, as computed settings do
+    for the settings they use.
+    """
+    from configurations import Configuration
+
+    class Read(Configuration):
+        ATTRIBUTE = 'value'
+
+        @property
+        def PROPERTY(self):
+            return 'value'
+
+    obj = Read()
+    name = setting.upper()
+    return lambda: getattr(obj, name)
+
+
+@benchmark(lines=[100, 1000], cached=[False, True])
+def load_dotenv(lines, cached):
+    """
+    Loads a ``.env`` file into the environment. Setting environment
+    variables gets slower with the size of the environment on most
+    platforms, hence the smaller files than in ``bench_dotenv``.
+    """
+    from configurations import Configuration
+
+    from .bench_dotenv import content
+
+    path = os.path.join(enter(tempfile.TemporaryDirectory()), '.env')
+    with open(path, 'w') as fp:
+        fp.write(content(lines))
+
+    class DotEnv(Configuration):
+        DOTENV = path
+
+    def load_dotenv():
+        if not cached:
+            dotenv._files.clear()
+            dotenv._merged.clear()
+        with mock.patch.dict(os.environ):
+            DotEnv.load_dotenv()
+    return load_dotenv
+
+
+@benchmark(settle=[False, True])
+def find_spec(settle):
+    """
+    Calls the finder for a module other than the settings module, as for
+    every import after the finder was installed, once the settings module
+    was found.
+    """
+    finder = importer.ConfigurationFinder(settle=settle)
+    package, _, _ = finder.module.rpartition('.')
+    finder.find_spec(finder.module, import_module(package).__path__)
+    return lambda: finder.find_spec('benchmarks.other')
+
+
+@benchmark(modules=[2000], finder=[False, True])
+def import_modules(modules, finder):
+    """
+    Imports a package of small modules, with or without the finder at the
+    start of ``sys.meta_path``.
+    """
+    directory = enter(tempfile.TemporaryDirectory())
+    package = os.path.join(directory, 'many')
+    os.mkdir(package)
+    open(os.path.join(package, '__init__.py'), 'w').close()
+    names = []
+    for number in range(modules):
+        with open(os.path.join(package, f'module{number}.py'), 'w') as fp:
+            fp.write(f'VALUE = {number}\n')
+        names.append(f'many.module{number}')
+    enter(mock.patch.object(sys, 'path', [directory, *sys.path]))
+    enter(mock.patch.dict(sys.modules))
+
+    def import_modules():
+        finders = [instance for instance in sys.meta_path
+                   if isinstance(instance, importer.ConfigurationFinder)]
+        if not finder:
+            for instance in finders:
+                sys.meta_path.remove(instance)
+        try:
+            for name in names:
+                sys.modules.pop(name, None)
+            for name in names:
+                import_module(name)
+        finally:
+            if not finder:
+                sys.meta_path[:0] = finders
+    return import_modules
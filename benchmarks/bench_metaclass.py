@@ -0,0 +1,32 @@
+from configurations import Configuration
+
+from .harness import benchmark
+
+
+def hierarchy(depth, shared=False):
+    """
+    A configuration class with ``depth`` ancestors, each of them combining
+    the previous level with a mixin.
+    """
+    cls = Configuration
+    for level in range(depth):
+        mixin = type(f'Mixin{level}', (), {f'MIXIN_SETTING_{level}': level})
+        attrs = {'__module__': __name__, f'SETTING_{level}': level}
+        if level == 0:
+            attrs['SHARED_DEFAULTS'] = shared
+        cls = type(cls)(f'Level{level}', (mixin, cls), attrs)
+    return cls
+
+
+@benchmark(depth=[1, 5, 10, 20], shared=[False, True])
+def create_hierarchy(depth, shared):
+    return lambda: hierarchy(depth, shared)
+
+
+@benchmark(depth=[1, 5, 10, 20], shared=[False, True])
+def create_subclass(depth, shared):
+    parent = hierarchy(depth, shared)
+
+    def create():
+        type(parent)('Leaf', (parent,), {'__module__': __name__})
+    return create
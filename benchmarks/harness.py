@@ -0,0 +1,61 @@
+import contextlib
+import itertools
+import os
+import timeit
+
+registry = []
+
+# the exit stack of the benchmark case being set up
+_stacks = []
+
+
+class Benchmark:
+    """
+    A benchmark function returns the callable to time, after doing any
+    setup for the given parameters.
+    """
+    def __init__(self, func, params):
+        self.func = func
+        self.name = f'{func.__module__.rpartition(".")[2]}.{func.__name__}'
+        self.params = params
+
+    def cases(self):
+        names = list(self.params)
+        for values in itertools.product(*self.params.values()):
+            yield dict(zip(names, values))
+
+    def run(self, repeat=5, **params):
+        with contextlib.ExitStack() as stack:
+            _stacks.append(stack)
+            try:
+                timer = timeit.Timer(self.func(**params))
+            finally:
+                _stacks.pop()
+            number, _ = timer.autorange()
+            return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def benchmark(**params):
+    """
+    Register a benchmark, optionally run for every combination of the
+    given parameter values, e.g. ``@benchmark(depth=[1, 10])``.
+    """
+    def decorator(func):
+        registry.append(Benchmark(func, params))
+        return func
+    return decorator
+
+
+def enter(context_manager):
+    """
+    Enters the context manager while the benchmark case being set up runs
+    and returns its value, e.g. ``enter(tempfile.TemporaryDirectory())``.
+    """
+    return _stacks[-1].enter_context(context_manager)
+
+
+def setup_environment():
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'tests.settings.main')
+    os.environ.setdefault('DJANGO_CONFIGURATION', 'Test')
+    from configurations import importer
+    importer.install()
@@ -0,0 +1,93 @@
+"""
+Measures the memory of forked workers after serving a request and
+collecting the garbage, once with ``configurations.wsgi`` and once with
+``configurations.wsgi_prefork`` loaded in the master process, like
+``gunicorn --preload`` does::
+
+    python -m benchmarks.prefork --workers=4
+
+Only works on Linux, which reports the memory in ``/proc/<pid>/smaps_rollup``.
+"""
+import argparse
+import gc
+import importlib
+import json
+import os
+import subprocess
+import sys
+from wsgiref.util import setup_testing_defaults
+
+from configurations.profiler import process_memory
+
+entry_points = ['configurations.wsgi', 'configurations.wsgi_prefork']
+
+
+def worker(application, fd):
+    environ = {'HTTP_HOST': 'localhost', 'PATH_INFO': '/'}
+    setup_testing_defaults(environ)
+    response = application(environ, lambda status, headers: None)
+    b''.join(response)
+    response.close()
+    gc.collect()
+    with os.fdopen(fd, 'w') as fp:
+        json.dump(process_memory(), fp)
+
+
+def serve(entry_point, workers):
+    """
+    Loads the entry point and forks the workers, printing their memory.
+    """
+    application = importlib.import_module(entry_point).application
+    children = []
+    for _ in range(workers):
+        read, write = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read)
+            try:
+                worker(application, write)
+            finally:
+                os._exit(0)
+        os.close(write)
+        children.append((pid, read))
+    results = []
+    for pid, read in children:
+        with os.fdopen(read) as fp:
+            results.append(json.load(fp))
+        os.waitpid(pid, 0)
+    print(json.dumps(results))
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.prefork')
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--serve', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.serve:
+        serve(args.serve, args.workers)
+        return
+    if process_memory() is None:
+        sys.exit('The memory of processes is only available on Linux.')
+
+    environ = dict(os.environ,
+                   DJANGO_SETTINGS_MODULE=f'{__package__}.settings',
+                   DJANGO_CONFIGURATION='Prefork',
+                   DJANGO_CONFIGURATION_CACHE='')
+    print(f'{"entry point":<30} {"private KiB":>12} {"PSS KiB":>12} '
+          f'{"RSS KiB":>12}')
+    for entry_point in entry_points:
+        output = subprocess.check_output(
+            [sys.executable, '-m', f'{__package__}.prefork',
+             f'--workers={args.workers}', f'--serve={entry_point}'],
+            env=environ)
+        results = json.loads(output)
+
+        def average(field):
+            return sum(result[field] for result in results) / len(results)
+
+        print(f'{entry_point:<30} {average("Private_Dirty"):>12.0f} '
+              f'{average("Pss"):>12.0f} {average("Rss"):>12.0f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+"""
+A settings module with a configuration of typical size for the import
+benchmarks.
+"""
+from configurations import Configuration, values
+
+
+class Common(Configuration):
+    SECRET_KEY = 'benchmark'
+    DEBUG = values.BooleanValue(False)
+    ALLOWED_HOSTS = values.ListValue(['localhost'])
+    INTERNAL_IPS = values.TupleValue(('127.0.0.1',))
+    INSTALLED_APPS = [
+        'django.contrib.admin',
+        'django.contrib.auth',
+        'django.contrib.contenttypes',
+        'django.contrib.sessions',
+        'django.contrib.messages',
+        'django.contrib.staticfiles',
+    ]
+    DATABASES = values.DatabaseURLValue('sqlite:///db.sqlite3')
+    CACHES = values.CacheURLValue('locmem://')
+    EMAIL = values.EmailURLValue('console://')
+    TIME_ZONE = values.Value('UTC')
+    SESSION_COOKIE_AGE = values.IntegerValue(1209600)
+    ADMINS = values.SingleNestedTupleValue((('Admin', 'admin@example.com'),))
+    DEFAULT_FROM_EMAIL = values.EmailValue('webmaster@example.com')
+    SITE_URL = values.URLValue('https://example.com/')
+    LOGGING_LEVELS = values.DictValue({'django': 'INFO'})
+
+    @property
+    def SESSION_COOKIE_SECURE(self):
+        return not self.DEBUG
+
+    def CSRF_TRUSTED_ORIGINS(self):
+        return [self.SITE_URL.rstrip('/')]
+
+
+class Bench(Common):
+    pass
+
+
+class LazyBench(Common):
+    LAZY_SETTINGS = True
+
+
+class Prefork(Common):
+    ROOT_URLCONF = 'benchmarks.urls'
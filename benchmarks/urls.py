@@ -0,0 +1,11 @@
+from django.http import HttpResponse
+from django.urls import path
+
+
+def index(request):
+    return HttpResponse('benchmark')
+
+
+urlpatterns = [
+    path('', index),
+]
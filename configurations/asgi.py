@@ -1,6 +1,6 @@
 from . import importer
 
-importer.install()
+importer.install(settle=True)
 
 from django.core.asgi import get_asgi_application  # noqa: E402
 
@@ -0,0 +1,71 @@
+"""
+An ASGI application that sets up the configuration and Django when the
+server starts up, on the lifespan startup event or else on the first
+connection, in a thread so that the event loop of the server isn't
+blocked::
+
+    uvicorn configurations.asgi_async:application
+
+The resolvers of the values (see :class:`~configurations.values.Value`)
+run concurrently while the configuration is set up.
+"""
+import asyncio
+import logging
+
+from . import importer
+
+logger = logging.getLogger(__name__)
+
+importer.install(settle=True)
+
+
+def get_asgi_application():
+    from django.core.asgi import get_asgi_application
+
+    return get_asgi_application()
+
+
+class Application:
+    """
+    Builds the ASGI application of Django once and hands all connections
+    except the lifespan ones over to it.
+    """
+    def __init__(self, build=get_asgi_application):
+        self.build = build
+        self.application = None
+        self.lock = None
+
+    async def setup(self):
+        if self.application is None:
+            if self.lock is None:
+                self.lock = asyncio.Lock()
+            async with self.lock:
+                if self.application is None:
+                    self.application = await asyncio.to_thread(self.build)
+        return self.application
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self.lifespan(receive, send)
+            return
+        application = await self.setup()
+        await application(scope, receive, send)
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                try:
+                    await self.setup()
+                except Exception as err:
+                    logger.exception("Couldn't set up the application")
+                    await send({'type': 'lifespan.startup.failed',
+                                'message': str(err)})
+                    return
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+
+application = Application()
@@ -0,0 +1,77 @@
+"""
+Refreshing the settings when a ``.env`` file changes under the autoreloader
+of the ``runserver`` command, instead of restarting the server.
+"""
+import logging
+import os
+from pathlib import Path
+
+from django.utils import autoreload
+
+from .base import dotenv_paths
+
+logger = logging.getLogger(__name__)
+
+# settings only read while Django starts up, changing them still restarts
+# the server
+RESTART_SETTINGS = frozenset([
+    'AUTH_USER_MODEL',
+    'CACHES',
+    'DATABASES',
+    'INSTALLED_APPS',
+    'LOGGING',
+    'LOGGING_CONFIG',
+    'MIDDLEWARE',
+    'ROOT_URLCONF',
+    'STORAGES',
+    'TEMPLATES',
+])
+
+# the configuration classes by the absolute path of their .env files
+_watched = {}
+
+
+def watch(cls):
+    """
+    Watches the ``.env`` files of the configuration with the autoreloader
+    once it starts.
+    """
+    if not cls.DOTENV_LOADED:
+        return
+    for path in dotenv_paths(cls.DOTENV_LOADED):
+        classes = _watched.setdefault(os.path.abspath(path), [])
+        if cls not in classes:
+            classes.append(cls)
+    autoreload.autoreload_started.connect(started, dispatch_uid=__name__)
+    autoreload.file_changed.connect(changed, dispatch_uid=__name__)
+
+
+def started(sender, **kwargs):
+    for path in _watched:
+        sender.extra_files.add(Path(path))
+
+
+def changed(sender, file_path, **kwargs):
+    """
+    Refreshes the configurations using the changed file, returning whether
+    that replaces restarting the server.
+    """
+    classes = _watched.get(os.path.abspath(file_path))
+    if not classes:
+        return None
+    changes = {}
+    try:
+        for cls in classes:
+            changes.update(cls.refresh())
+    except Exception:
+        logger.exception('Refreshing the settings after %s changed failed',
+                         file_path)
+        return False
+    restart = sorted(RESTART_SETTINGS.intersection(changes))
+    if restart:
+        logger.info('%s changed %s, restarting.', file_path,
+                    ', '.join(restart))
+        return False
+    logger.info('%s changed, refreshed %s.', file_path,
+                ', '.join(sorted(changes)) or 'no settings')
+    return True
@@ -1,73 +1,444 @@
+import inspect
 import os
-import re
+import threading
+import types
+import weakref
+from functools import lru_cache, wraps
 
 from django.conf import global_settings
 from django.core.exceptions import ImproperlyConfigured
 
-from .utils import uppercase_attributes
-from .values import Value, setup_value
+from .dotenv import read_files as read_dotenv_files
+from .prefetch import prefetching
+from .profiler import measure
+from .utils import isuppercase, uppercase_attributes
+from .values import Value, resolve_values, setting_up, setup_value
 
 __all__ = ['Configuration']
 
 
+# environment variables read by Django and django-configurations
+KNOWN_ENVIRON = frozenset([
+    'DJANGO_SETTINGS_MODULE',
+    'DJANGO_CONFIGURATION',
+    'DJANGO_CONFIGURATION_CACHE',
+    'DJANGO_CONFIGURATION_PROFILE',
+    'DJANGO_ALLOW_ASYNC_UNSAFE',
+    'DJANGO_AUTO_COMPLETE',
+    'DJANGO_COLORS',
+    'DJANGO_RUNSERVER_HIDE_WARNING',
+    'DJANGO_TEST_PROCESSES',
+    'DJANGO_WATCHMAN_TIMEOUT',
+])
+KNOWN_ENVIRON_PREFIXES = ('DJANGO_SUPERUSER_',)
+
+# the environment each configuration was set up from by the importer
+environments = weakref.WeakKeyDictionary()
+# the values each configuration set up, to set them up again on refresh
+resolved_values = weakref.WeakKeyDictionary()
+# the environment variables each configuration set from its .env files
+dotenv_environ = weakref.WeakKeyDictionary()
+
+
 install_failure = ("django-configurations settings importer wasn't "
                    "correctly installed. Please use one of the starter "
                    "functions to install it as mentioned in the docs: "
                    "https://django-configurations.readthedocs.io/")
 
 
+DEPRECATED_SETTINGS = frozenset({
+    # DEFAULT_HASHING_ALGORITHM is always deprecated, as it's a
+    # transitional setting
+    # https://docs.djangoproject.com/en/3.1/releases/3.1/#default-hashing-algorithm-settings
+    "DEFAULT_HASHING_ALGORITHM",
+    # DEFAULT_CONTENT_TYPE and FILE_CHARSET are deprecated in
+    # Django 2.2 and are removed in Django 3.0
+    "DEFAULT_CONTENT_TYPE",
+    "FILE_CHARSET",
+    # When DEFAULT_AUTO_FIELD is not explicitly set, Django's emits a
+    # system check warning models.W042. This warning should not be
+    # suppressed, as downstream users are expected to make a decision.
+    # https://docs.djangoproject.com/en/3.2/releases/3.2/#customizing-type-of-auto-created-primary-keys
+    "DEFAULT_AUTO_FIELD",
+    # FORMS_URLFIELD_ASSUME_HTTPS is a transitional setting introduced
+    # in Django 5.0.
+    # https://docs.djangoproject.com/en/5.0/releases/5.0/#id2
+    "FORMS_URLFIELD_ASSUME_HTTPS"
+})
+
+
+@lru_cache(maxsize=None)
+def global_settings_attributes():
+    """
+    The uppercase attributes of Django's global settings, which don't
+    change during the lifetime of the process.
+    """
+    return uppercase_attributes(global_settings)
+
+
+# uppercase attributes of configuration classes by class, dropped when
+# the class or one of its configuration base classes is modified
+_attributes_cache = weakref.WeakKeyDictionary()
+
+
+def cached_uppercase_attributes(cls):
+    if not isinstance(cls, ConfigurationBase):
+        return uppercase_attributes(cls)
+    try:
+        return _attributes_cache[cls]
+    except KeyError:
+        attributes = _attributes_cache[cls] = uppercase_attributes(cls)
+        return attributes
+
+
+def invalidate_uppercase_attributes(cls):
+    classes = [cls]
+    while classes:
+        cls = classes.pop()
+        _attributes_cache.pop(cls, None)
+        classes.extend(type.__subclasses__(cls))
+
+
+def is_computed(value):
+    """
+    Whether the value of a class attribute is a setting that is computed
+    on the configuration instance, i.e. a property or non-pristine callable.
+    """
+    if isinstance(value, property):
+        return True
+    return callable(value) and not getattr(value, 'pristine', False)
+
+
+class Evaluation:
+    """
+    Evaluates the computed settings of a configuration instance. The
+    settings a computed setting uses are evaluated first, when it accesses
+    them, so the evaluation follows the dependencies between them and a
+    cycle raises an error. With ``memoize`` each computed setting is only
+    evaluated once.
+    """
+    def __init__(self, memoize=False):
+        self.memoize = memoize
+        self.results = {}
+        self.local = threading.local()
+
+    @property
+    def stack(self):
+        try:
+            return self.local.stack
+        except AttributeError:
+            stack = self.local.stack = []
+            return stack
+
+    def evaluate(self, name, function, obj):
+        stack = self.stack
+        if stack and stack[-1][0] == name and stack[-1][1] is not function:
+            # the setting of a parent class, read with super()
+            return function(obj)
+        if self.memoize:
+            try:
+                return self.results[name]
+            except KeyError:
+                pass
+        if stack:
+            names = [entry[0] for entry in stack]
+            if name in names:
+                cycle = names[names.index(name):] + [name]
+                raise ImproperlyConfigured(
+                    f"The computed settings {' -> '.join(cycle)} depend on "
+                    f"each other")
+        stack.append((name, function))
+        try:
+            result = function(obj)
+        finally:
+            stack.pop()
+        if self.memoize:
+            self.results[name] = result
+        return result
+
+
+def evaluation(obj):
+    """
+    Returns the :class:`Evaluation` of the configuration instance.
+    """
+    try:
+        return object.__getattribute__(obj, '_evaluation')
+    except AttributeError:
+        result = Evaluation(
+            memoize=getattr(type(obj), 'MEMOIZE_COMPUTED', False))
+        object.__setattr__(obj, '_evaluation', result)
+        return result
+
+
+def evaluated(name, attribute):
+    """
+    Wraps the property or method of a computed setting once, when it's set
+    on the configuration class, so that the :class:`Evaluation` of the
+    instance evaluates it when it's read or called without arguments.
+    Other attributes are returned as they are.
+    """
+    if isinstance(attribute, property):
+        if attribute.fget is None:
+            return attribute
+        return attribute.getter(evaluated(name, attribute.fget))
+    if (not isinstance(attribute, types.FunctionType)
+            or getattr(attribute, 'pristine', False)
+            or getattr(attribute, 'evaluated', False)):
+        return attribute
+
+    @wraps(attribute)
+    def setting(self, *args, **kwargs):
+        if args or kwargs:
+            return attribute(self, *args, **kwargs)
+        return evaluation(self).evaluate(name, attribute, self)
+    setting.evaluated = True
+    return setting
+
+
+def code_names(code):
+    """
+    Returns the names the code object and the functions and comprehensions
+    defined in it use, e.g. the attributes they read.
+    """
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            names.update(code_names(const))
+    return names
+
+
+def defined_functions(cls, name, inherited=False):
+    """
+    Returns the function of the method or property with the given name of
+    the class, and with ``inherited`` also those of its parent classes.
+    """
+    functions = []
+    for klass in cls.__mro__:
+        if name not in vars(klass):
+            continue
+        attribute = vars(klass)[name]
+        if isinstance(attribute, property):
+            attribute = attribute.fget
+        elif isinstance(attribute, (classmethod, staticmethod)):
+            attribute = attribute.__func__
+        if isinstance(attribute, types.FunctionType):
+            functions.append(inspect.unwrap(attribute))
+        if not inherited:
+            break
+    return functions
+
+
+def computed_dependencies(cls):
+    """
+    Returns the settings each computed setting of the configuration class
+    uses, by setting name. They're found in the code of the property or
+    method, the other methods of the class it calls and, when it reads its
+    own name, e.g. with ``super()``, the same setting of the parent classes.
+    Settings read with ``getattr()`` and a computed name aren't found.
+    """
+    settings = {name for name in dir(cls) if isuppercase(name)}
+    dependencies = {}
+    for name in cls._registered('_computed_names'):
+        used = set()
+        functions = defined_functions(cls, name)
+        while functions:
+            for used_name in code_names(functions.pop().__code__) - used:
+                used.add(used_name)
+                if used_name == name:
+                    functions.extend(
+                        defined_functions(cls, name, inherited=True)[1:])
+                elif not isuppercase(used_name):
+                    functions.extend(defined_functions(cls, used_name))
+        dependencies[name] = (used & settings) - {name}
+    return dependencies
+
+
+# the options leaving values to be set up when they're first read
+DEFERRING_OPTIONS = ('LAZY_SETTINGS', 'PREFETCH_VALUES')
+
+
+def setup_deferred(self, name):
+    """
+    The ``__getattribute__`` method of configurations with one of the
+    :data:`DEFERRING_OPTIONS`, which sets up the values that haven't been
+    set up yet by the first thread reading them.
+    """
+    value = object.__getattribute__(self, name)
+    if isinstance(value, Value) and isuppercase(name):
+        cls = type(self)
+        prefetch = prefetching.get(cls)
+        if prefetch is not None and name in prefetch:
+            # the background thread setting it up holds the flight
+            cls._setup_value(name, value)
+        else:
+            with setting_up(id(value)):
+                if object.__getattribute__(self, name) is value:
+                    cls._setup_value(name, value)
+        value = object.__getattribute__(self, name)
+    return value
+
+
+def shares_defaults(bases, attrs):
+    if 'SHARED_DEFAULTS' in attrs:
+        return bool(attrs['SHARED_DEFAULTS'])
+    for base in bases:
+        if hasattr(base, 'SHARED_DEFAULTS'):
+            return bool(base.SHARED_DEFAULTS)
+    return False
+
+
+def dotenv_paths(dotenv):
+    # DOTENV can be a single path or a list of paths to read in order
+    if isinstance(dotenv, (str, os.PathLike)):
+        return [dotenv]
+    return list(dotenv)
+
+
+def read_dotenv(dotenv):
+    """
+    Returns the variables of the ``.env`` file or list of files.
+    """
+    paths = dotenv_paths(dotenv)
+
+    # now check if we can access the file since we know we really want to
+    try:
+        with measure('dotenv', ', '.join(map(os.fspath, paths))):
+            return read_dotenv_files(paths)
+    except OSError as e:
+        raise ImproperlyConfigured("Couldn't read .env file "
+                                   "with the path {}. Error: "
+                                   "{}".format(e.filename or dotenv,
+                                               e)) from e
+
+
+def reload_dotenv(cls):
+    """
+    Applies the changes of the ``.env`` files the configuration loaded to
+    :data:`os.environ`, except for the variables set otherwise since.
+    """
+    for klass in cls.__mro__:
+        if klass in dotenv_environ:
+            break
+    else:
+        return
+    applied = dotenv_environ[klass]
+    values = read_dotenv(klass.DOTENV_LOADED)
+    for key, val in list(applied.items()):
+        if os.environ.get(key) != val:
+            del applied[key]
+        elif key not in values:
+            del os.environ[key]
+            del applied[key]
+    for key, val in values.items():
+        if key in applied or key not in os.environ:
+            os.environ[key] = applied[key] = val
+
+
 class ConfigurationBase(type):
 
     def __new__(cls, name, bases, attrs):
-        if bases not in ((object,), ()) and bases[0].__name__ != 'NewBase':
-            # if this is actually a subclass in a settings module
-            # we better check if the importer was correctly installed
-            from . import importer
-            if not importer.installed:
-                raise ImproperlyConfigured(install_failure)
-        settings_vars = uppercase_attributes(global_settings)
-        parents = [base for base in bases if isinstance(base,
-                                                        ConfigurationBase)]
-        if parents:
-            for base in bases[::-1]:
-                settings_vars.update(uppercase_attributes(base))
-
-        deprecated_settings = {
-            # DEFAULT_HASHING_ALGORITHM is always deprecated, as it's a
-            # transitional setting
-            # https://docs.djangoproject.com/en/3.1/releases/3.1/#default-hashing-algorithm-settings
-            "DEFAULT_HASHING_ALGORITHM",
-            # DEFAULT_CONTENT_TYPE and FILE_CHARSET are deprecated in
-            # Django 2.2 and are removed in Django 3.0
-            "DEFAULT_CONTENT_TYPE",
-            "FILE_CHARSET",
-            # When DEFAULT_AUTO_FIELD is not explicitly set, Django's emits a
-            # system check warning models.W042. This warning should not be
-            # suppressed, as downstream users are expected to make a decision.
-            # https://docs.djangoproject.com/en/3.2/releases/3.2/#customizing-type-of-auto-created-primary-keys
-            "DEFAULT_AUTO_FIELD",
-            # FORMS_URLFIELD_ASSUME_HTTPS is a transitional setting introduced
-            # in Django 5.0.
-            # https://docs.djangoproject.com/en/5.0/releases/5.0/#id2
-            "FORMS_URLFIELD_ASSUME_HTTPS"
-        }
-        # PASSWORD_RESET_TIMEOUT_DAYS is deprecated in favor of
-        # PASSWORD_RESET_TIMEOUT in Django 3.1
-        # https://github.com/django/django/commit/226ebb17290b604ef29e82fb5c1fbac3594ac163#diff-ec2bed07bb264cb95a80f08d71a47c06R163-R170
-        if "PASSWORD_RESET_TIMEOUT" in settings_vars:
-            deprecated_settings.add("PASSWORD_RESET_TIMEOUT_DAYS")
-        # DEFAULT_FILE_STORAGE and STATICFILES_STORAGE are deprecated
-        # in favor of STORAGES.
-        # https://docs.djangoproject.com/en/dev/releases/4.2/#custom-file-storages
-        if "STORAGES" in settings_vars:
-            deprecated_settings.add("DEFAULT_FILE_STORAGE")
-            deprecated_settings.add("STATICFILES_STORAGE")
-        for deprecated_setting in deprecated_settings:
-            if deprecated_setting in settings_vars:
-                del settings_vars[deprecated_setting]
-        attrs = {**settings_vars, **attrs}
-
-        return super().__new__(cls, name, bases, attrs)
+        with measure('class', f"{attrs.get('__module__')}.{name}"):
+            attrs = {key: evaluated(key, value) if isuppercase(key) else value
+                     for key, value in attrs.items()}
+            if bases not in ((object,), ()) and bases[0].__name__ != 'NewBase':
+                # if this is actually a subclass in a settings module
+                # we better check if the importer was correctly installed
+                from . import importer
+                if not importer.installed:
+                    raise ImproperlyConfigured(install_failure)
+            parents = [base for base in bases if isinstance(base,
+                                                            ConfigurationBase)]
+            if parents and shares_defaults(bases, attrs):
+                # Django's global settings and the settings of the parent
+                # classes are found through the method resolution order
+                # which ends with the Configuration class holding the defaults
+                new_class = super().__new__(cls, name, bases, attrs)
+                declared = {}
+                for base in bases:
+                    if not isinstance(base, ConfigurationBase):
+                        declared.update(uppercase_attributes(base))
+                declared.update((name, getattr(new_class, name))
+                                for name in attrs if isuppercase(name))
+                new_class._register(declared)
+                return new_class
+
+            settings_vars = dict(global_settings_attributes())
+            if parents:
+                for base in bases[::-1]:
+                    settings_vars.update(cached_uppercase_attributes(base))
+
+            deprecated_settings = set(DEPRECATED_SETTINGS)
+            # PASSWORD_RESET_TIMEOUT_DAYS is deprecated in favor of
+            # PASSWORD_RESET_TIMEOUT in Django 3.1
+            # https://github.com/django/django/commit/226ebb17290b604ef29e82fb5c1fbac3594ac163#diff-ec2bed07bb264cb95a80f08d71a47c06R163-R170
+            if "PASSWORD_RESET_TIMEOUT" in settings_vars:
+                deprecated_settings.add("PASSWORD_RESET_TIMEOUT_DAYS")
+            # DEFAULT_FILE_STORAGE and STATICFILES_STORAGE are deprecated
+            # in favor of STORAGES.
+            # https://docs.djangoproject.com/en/dev/releases/4.2/#custom-file-storages
+            if "STORAGES" in settings_vars:
+                deprecated_settings.add("DEFAULT_FILE_STORAGE")
+                deprecated_settings.add("STATICFILES_STORAGE")
+            for deprecated_setting in deprecated_settings:
+                if deprecated_setting in settings_vars:
+                    del settings_vars[deprecated_setting]
+            attrs = {**settings_vars, **attrs}
+
+            new_class = super().__new__(cls, name, bases, attrs)
+            new_class._register({name: getattr(new_class, name)
+                                for name in attrs if isuppercase(name)})
+            return new_class
+
+    def _register(cls, attributes):
+        """
+        Record which of the given uppercase attributes of the class are
+        values or computed settings.
+        """
+        type.__setattr__(cls, '_value_names', {
+            name for name, value in attributes.items()
+            if isinstance(value, Value)})
+        type.__setattr__(cls, '_computed_names', {
+            name for name, value in attributes.items() if is_computed(value)})
+        cls._defer_values()
+
+    def _defer_values(cls):
+        """
+        Lets the instances set up the values of the class when they're
+        first read, if it has one of the :data:`DEFERRING_OPTIONS`. Other
+        configurations keep the regular attribute access.
+        """
+        if (cls.__getattribute__ is not setup_deferred
+                and any(getattr(cls, option, False)
+                        for option in DEFERRING_OPTIONS)):
+            type.__setattr__(cls, '__getattribute__', setup_deferred)
+
+    def __setattr__(cls, name, value):
+        if isuppercase(name):
+            value = evaluated(name, value)
+        super().__setattr__(name, value)
+        if isuppercase(name):
+            invalidate_uppercase_attributes(cls)
+            cls._value_names.discard(name)
+            cls._computed_names.discard(name)
+            if isinstance(value, Value):
+                cls._value_names.add(name)
+            elif is_computed(getattr(cls, name)):
+                cls._computed_names.add(name)
+            if name in DEFERRING_OPTIONS:
+                cls._defer_values()
+
+    def __delattr__(cls, name):
+        super().__delattr__(name)
+        if isuppercase(name):
+            invalidate_uppercase_attributes(cls)
+            cls._value_names.discard(name)
+            cls._computed_names.discard(name)
+
+    def _registered(cls, registry):
+        names = set()
+        for klass in cls.__mro__:
+            names.update(klass.__dict__.get(registry, ()))
+        return sorted(names)
 
     def __repr__(self):
         return "<Configuration '{}.{}'>".format(self.__module__,
@@ -117,29 +488,13 @@ class Configuration(metaclass=ConfigurationBase):
         if not dotenv:
             return
 
-        # now check if we can access the file since we know we really want to
-        try:
-            with open(dotenv) as f:
-                content = f.read()
-        except OSError as e:
-            raise ImproperlyConfigured("Couldn't read .env file "
-                                       "with the path {}. Error: "
-                                       "{}".format(dotenv, e)) from e
-        else:
-            for line in content.splitlines():
-                m1 = re.match(r'\A([A-Za-z_0-9]+)=(.*)\Z', line)
-                if not m1:
-                    continue
-                key, val = m1.group(1), m1.group(2)
-                m2 = re.match(r"\A'(.*)'\Z", val)
-                if m2:
-                    val = m2.group(1)
-                m3 = re.match(r'\A"(.*)"\Z', val)
-                if m3:
-                    val = re.sub(r'\\(.)', r'\1', m3.group(1))
-                os.environ.setdefault(key, val)
-
-            cls.DOTENV_LOADED = dotenv
+        values = read_dotenv(dotenv)
+        applied = dotenv_environ.setdefault(cls, {})
+        for key, val in values.items():
+            if key not in os.environ:
+                os.environ[key] = applied[key] = val
+
+        cls.DOTENV_LOADED = dotenv
 
     @classmethod
     def pre_setup(cls):
@@ -152,6 +507,125 @@ class Configuration(metaclass=ConfigurationBase):
 
     @classmethod
     def setup(cls):
-        for name, value in uppercase_attributes(cls).items():
-            if isinstance(value, Value):
-                setup_value(cls, name, value)
+        lazy = getattr(cls, 'LAZY_SETTINGS', False)
+        # values setting multiple settings are always set up since
+        # their names aren't known before
+        pending = {name: value
+                   for name, value in cls._pending_values().items()
+                   if not lazy or value.multiple}
+        prefetch = prefetching.get(cls)
+        if prefetch is not None:
+            # joined when first needed, except for multiple settings
+            pending = {name: value for name, value in pending.items()
+                       if value.multiple or name not in prefetch}
+        # run the resolvers of all values at once, so they overlap
+        resolve_values(pending.items())
+        for name, value in pending.items():
+            cls._setup_value(name, value)
+
+    @classmethod
+    def _setup_value(cls, name, value):
+        prefetch = prefetching.get(cls)
+        if prefetch is not None and name in prefetch:
+            setup_value(cls, name, value, prefetch.join(name))
+        else:
+            setup_value(cls, name, value)
+        resolved_values.setdefault(cls, {})[name] = value
+
+    @classmethod
+    def refresh(cls, names=None):
+        """
+        Sets up the values whose environment variables or ``.env`` entries
+        changed since the importer set up the configuration again, or only
+        the values with the given names, as well as the computed settings
+        using them, and updates the settings.
+
+        Returns the changed settings as a dictionary of setting names to
+        tuples of the old and the new value, which is also sent with the
+        :data:`~configurations.signals.settings_refreshed` signal.
+        """
+        from .importer import refresh
+        return refresh(cls, names)
+
+    @classmethod
+    def values(cls):
+        """
+        Returns the :class:`~configurations.values.Value` instances of the
+        configuration and its parent configurations by setting name, also
+        the ones that have been set up, unless they were dropped with
+        ``DROP_VALUES``.
+        """
+        names = set(cls._registered('_value_names'))
+        for klass in cls.__mro__:
+            names.update(resolved_values.get(klass, ()))
+        values = {}
+        for name in sorted(names):
+            # the value of the class defining the setting, if it is one
+            for klass in cls.__mro__:
+                if name in vars(klass):
+                    value = vars(klass)[name]
+                    if not isinstance(value, Value):
+                        value = resolved_values.get(klass, {}).get(name)
+                    if value is not None:
+                        values[name] = value
+                    break
+        return values
+
+    @classmethod
+    def _pending_values(cls):
+        """
+        Returns the values of the configuration that haven't been set up
+        yet, by setting name.
+        """
+        attributes = {name: getattr(cls, name)
+                      for name in cls._registered('_value_names')}
+        return {name: value for name, value in attributes.items()
+                if isinstance(value, Value)}
+
+    @classmethod
+    def computed_settings(cls):
+        """
+        Returns the properties and methods of the configuration whose
+        return value becomes the setting, by setting name.
+        """
+        attributes = {name: getattr(cls, name)
+                      for name in cls._registered('_computed_names')}
+        return {name: value for name, value in attributes.items()
+                if is_computed(value)}
+
+    @classmethod
+    def unused_environ(cls, prefixes=None):
+        """
+        Returns the names of the environment variables starting with the
+        prefix of one of the values of the configuration (or one of the
+        given prefixes) that no value looked up when the configuration was
+        set up by the importer, except those used by Django and
+        django-configurations themselves.
+        """
+        environment = environments.get(cls)
+        if environment is None:
+            return []
+        return [name for name in environment.unused(prefixes)
+                if name not in KNOWN_ENVIRON
+                and not name.startswith(KNOWN_ENVIRON_PREFIXES)]
+
+    @classmethod
+    def drop_values(cls):
+        """
+        Replaces the :class:`~configurations.values.Value` instances of the
+        configuration and its parent configurations that have been set up
+        with their resolved value, so that they can be garbage collected.
+        Values marked with ``per_worker`` are kept.
+        """
+        for klass in cls.__mro__:
+            if not isinstance(klass, ConfigurationBase):
+                continue
+            kept = {name: value for name, value
+                    in resolved_values.pop(klass, {}).items()
+                    if value.per_worker}
+            if kept:
+                resolved_values[klass] = kept
+            for name, value in list(vars(klass).items()):
+                if (isinstance(value, Value) and hasattr(value, '_value')
+                        and not value.per_worker):
+                    setattr(klass, name, value._value)
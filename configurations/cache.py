@@ -0,0 +1,187 @@
+"""
+Persistent snapshots of resolved settings.
+
+When the ``DJANGO_CONFIGURATION_CACHE`` environment variable points to a
+directory, the resolved uppercase settings of a configuration are pickled
+there after the settings module has been set up. The next process with the
+same inputs loads them straight into the settings module instead of executing
+it and resolving its values again.
+
+A snapshot is only used if all of its inputs are unchanged:
+
+- the settings module path and configuration class name,
+- the complete process environment,
+- the Python, Django and django-configurations versions,
+- the modification time and size of the settings module, of every module
+  it imported for the first time and of the loaded ``.env`` file(s).
+"""
+import hashlib
+import io
+import logging
+import os
+import pickle
+import sys
+import tempfile
+import types
+
+import django
+
+from .utils import isuppercase
+from .version import __version__
+
+CACHE_ENVIRONMENT_VARIABLE = 'DJANGO_CONFIGURATION_CACHE'
+
+logger = logging.getLogger(__name__)
+
+
+def cache_dir():
+    return os.environ.get(CACHE_ENVIRONMENT_VARIABLE) or None
+
+
+def fingerprint(module_name, class_name, environ):
+    digest = hashlib.sha256()
+    for part in (sys.version, django.__version__, __version__ or '',
+                 str(pickle.HIGHEST_PROTOCOL), module_name, class_name):
+        digest.update(part.encode('utf-8', 'surrogateescape'))
+        digest.update(b'\0')
+    for key, value in sorted(environ.items()):
+        digest.update(f'{key}={value}'.encode('utf-8', 'surrogateescape'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def file_signature(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def write_atomic(path, content):
+    """
+    Writes the bytes to the file with the given path, so that concurrent
+    readers either see the old or the new content.
+    """
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    with tempfile.NamedTemporaryFile(dir=directory, delete=False) as fp:
+        try:
+            fp.write(content)
+        except BaseException:
+            fp.close()
+            os.unlink(fp.name)
+            raise
+    os.replace(fp.name, path)
+
+
+def sources(module, cls, modules):
+    """
+    Returns the signatures of the files the settings of the module were
+    set up from: the module itself, the modules imported for the first
+    time, i.e. missing from ``modules``, and the loaded ``.env`` file(s).
+    """
+    paths = [module.__file__]
+    for name in set(sys.modules) - modules:
+        path = getattr(sys.modules[name], '__file__', None)
+        if path:
+            paths.append(path)
+    dotenv = getattr(cls, 'DOTENV_LOADED', None)
+    if isinstance(dotenv, (list, tuple)):
+        paths.extend(dotenv)
+    elif dotenv:
+        paths.append(dotenv)
+    return {path: file_signature(path) for path in paths}
+
+
+def unchanged(sources):
+    return all(file_signature(path) == signature
+               for path, signature in sources.items())
+
+
+class SettingsPickler(pickle.Pickler):
+    """
+    Refuses to pickle functions and classes defined in the settings module
+    itself, since the module isn't executed when the snapshot is restored.
+    """
+    def __init__(self, file, module_name):
+        super().__init__(file, pickle.HIGHEST_PROTOCOL)
+        self.module_name = module_name
+
+    def reducer_override(self, obj):
+        if (isinstance(obj, (type, types.FunctionType))
+                and getattr(obj, '__module__', None) == self.module_name):
+            raise pickle.PicklingError(
+                f'{obj!r} is defined in the settings module')
+        return NotImplemented
+
+
+class Snapshot:
+    """
+    A snapshot of the settings of one configuration class.
+
+    Create it before the settings module is executed, so that it can
+    record which environment variables and modules the execution adds.
+    """
+    def __init__(self, directory, module_name, class_name):
+        self.path = os.path.join(directory,
+                                 f'{module_name}.{class_name}.pickle')
+        self.module_name = module_name
+        self.environ = dict(os.environ)
+        self.modules = set(sys.modules)
+        self.key = fingerprint(module_name, class_name, self.environ)
+
+    def restore(self, module):
+        """
+        Populate the module with the cached settings, returning whether
+        a valid snapshot was found.
+        """
+        try:
+            with open(self.path, 'rb') as fp:
+                data = pickle.load(fp)
+        except FileNotFoundError:
+            return False
+        except Exception as err:
+            logger.debug("Couldn't read settings snapshot %s: %s",
+                         self.path, err)
+            return False
+        if data.get('key') != self.key:
+            return False
+        if not unchanged(data['sources']):
+            return False
+        for key, value in data['environ'].items():
+            os.environ.setdefault(key, value)
+        module.__dict__.update(data['settings'])
+        return True
+
+    def save(self, module, cls):
+        if getattr(cls, 'LAZY_SETTINGS', False):
+            # the settings that aren't set up yet would be missing from
+            # the snapshot, and setting them up defeats the lazy settings
+            return False
+        try:
+            settings = {name: value for name, value in vars(module).items()
+                        if isuppercase(name)}
+            environ = {key: value for key, value in os.environ.items()
+                       if key not in self.environ}
+            data = {
+                'key': self.key,
+                'sources': sources(module, cls, self.modules),
+                'environ': environ,
+                'settings': settings,
+            }
+            buffer = io.BytesIO()
+            SettingsPickler(buffer, self.module_name).dump(data)
+            write_atomic(self.path, buffer.getvalue())
+        except Exception as err:
+            logger.debug("Couldn't write settings snapshot %s: %s",
+                         self.path, err)
+            return False
+        return True
+
+
+def get_snapshot(module_name, class_name):
+    directory = cache_dir()
+    if directory is None:
+        return None
+    return Snapshot(directory, module_name, class_name)
@@ -0,0 +1,34 @@
+"""
+System checks of settings whose validation was deferred until Django's
+system checks run, e.g. with ``python manage.py check``.
+"""
+from django.core import checks
+from django.utils.module_loading import import_string
+
+from . import values
+
+# dotted paths of BackendsValue values created with deferred=True
+deferred_backends = set()
+
+_registered = False
+
+
+def check_backends(app_configs=None, **kwargs):
+    errors = []
+    for path in sorted(deferred_backends - values.validated_backends):
+        try:
+            import_string(path)
+        except ImportError as err:
+            errors.append(checks.Error(
+                f"Couldn't import the backend {path!r}: {err}",
+                id='configurations.E001'))
+        else:
+            values.validated_backends.add(path)
+    return errors
+
+
+def register_backends_check():
+    global _registered
+    if not _registered:
+        checks.register(check_backends)
+        _registered = True
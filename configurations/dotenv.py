@@ -0,0 +1,170 @@
+"""
+Reading of ``.env`` files.
+
+Each line of the form ``KEY=value`` (optionally prefixed with ``export``)
+defines a variable, other lines are ignored. Values in single or double
+quotes may be followed by a ``# comment``, backslash escapes are resolved
+in double quoted values. A quoted value without a closing quote on its
+first line continues up to the next line with a quote, if that quote ends
+the value.
+"""
+import hashlib
+import logging
+import os
+import pickle
+import re
+
+from .cache import cache_dir, file_signature, write_atomic
+
+assignment_re = re.compile(r'(?:export[ \t]+)?([A-Za-z_0-9]+)=(.*)\Z')
+escape_re = re.compile(r'\\(.)')
+trailing_re = re.compile(r'[ \t]*(?:#.*)?\Z')
+
+quotes = {'"', "'"}
+
+# parsed files by path and merged files by paths, along with the
+# modification time and size of the files when they were read
+_files = {}
+_merged = {}
+
+logger = logging.getLogger(__name__)
+
+
+def find_quote(value, quote, start):
+    """
+    Returns the index of the first quote in the value at or after
+    ``start`` that isn't escaped with a backslash, or -1.
+    """
+    index = value.find(quote, start)
+    if quote == '"':
+        while index != -1:
+            backslashes = index - len(value[:index].rstrip('\\'))
+            if not backslashes % 2:
+                break
+            index = value.find(quote, index + 1)
+    return index
+
+
+def is_closing(value, index):
+    """
+    Whether the quote at the index ends the value, i.e. is followed by
+    nothing but a comment.
+    """
+    return index != -1 and trailing_re.match(value, index + 1) is not None
+
+
+def unescape(match):
+    return match.group(1)
+
+
+def unquote(value, quote):
+    if quote == '"' and '\\' in value:
+        return escape_re.sub(unescape, value)
+    return value
+
+
+def parse(content):
+    """
+    Returns the variables defined in the content of a ``.env`` file, the
+    first definition of a variable wins.
+    """
+    values = {}
+    lines = content.splitlines()
+    count = len(lines)
+    index = 0
+    while index < count:
+        match = assignment_re.match(lines[index])
+        index += 1
+        if match is None:
+            continue
+        key, value = match.groups()
+        quote = value[:1]
+        if quote in quotes:
+            if len(value) > 1 and value[-1] == quote:
+                value = unquote(value[1:-1], quote)
+            else:
+                end = find_quote(value, quote, 1)
+                if end == -1:
+                    # the value continues up to the next line with a quote,
+                    # which must end it, otherwise the line is taken as is
+                    for last in range(index, count):
+                        end = find_quote(lines[last], quote, 0)
+                        if end == -1:
+                            continue
+                        if is_closing(lines[last], end):
+                            value = unquote('\n'.join(
+                                [value[1:]] + lines[index:last]
+                                + [lines[last][:end]]), quote)
+                            index = last + 1
+                        break
+                elif is_closing(value, end):
+                    value = unquote(value[1:end], quote)
+        if key not in values:
+            values[key] = value
+    return values
+
+
+def read(path):
+    """
+    Returns the variables defined in the ``.env`` file with the given path.
+
+    The parsed variables are kept for the lifetime of the process and, if
+    the ``DJANGO_CONFIGURATION_CACHE`` environment variable is set, cached
+    in that directory, until the modification time or size of the file
+    changes.
+    """
+    signature = file_signature(path)
+    key = os.path.abspath(path)
+    cached = _files.get(key)
+    if cached is not None and signature is not None and cached[0] == signature:
+        return cached[1]
+    values = read_uncached(path, signature)
+    if signature is not None:
+        _files[key] = (signature, values)
+    return values
+
+
+def read_files(paths):
+    """
+    Returns the variables defined in the ``.env`` files with the given
+    paths, the files later in the list overriding the earlier ones.
+    """
+    key = tuple(os.path.abspath(path) for path in paths)
+    signatures = [file_signature(path) for path in key]
+    cached = _merged.get(key)
+    if (cached is not None and None not in signatures
+            and cached[0] == signatures):
+        return cached[1]
+    values = {}
+    for path in paths:
+        values.update(read(path))
+    if None not in signatures:
+        _merged[key] = (signatures, values)
+    return values
+
+
+def read_uncached(path, signature):
+    directory = cache_dir()
+    if directory is None:
+        with open(path) as fp:
+            return parse(fp.read())
+
+    name = hashlib.sha256(os.path.abspath(path).encode('utf-8',
+                                                       'surrogateescape'))
+    cache_path = os.path.join(directory, f'dotenv-{name.hexdigest()}.pickle')
+    try:
+        with open(cache_path, 'rb') as fp:
+            cached_signature, values = pickle.load(fp)
+        if signature is not None and cached_signature == signature:
+            return values
+    except Exception:
+        pass
+
+    with open(path) as fp:
+        values = parse(fp.read())
+    try:
+        write_atomic(cache_path, pickle.dumps((signature, values),
+                                              pickle.HIGHEST_PROTOCOL))
+    except OSError as err:
+        logger.debug("Couldn't write .env cache %s: %s", cache_path, err)
+    return values
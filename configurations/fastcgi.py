@@ -1,5 +1,5 @@
 from . import importer
 
-importer.install()
+importer.install(settle=True)
 
 from django.core.servers.fastcgi import runfastcgi  # noqa
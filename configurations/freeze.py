@@ -0,0 +1,181 @@
+"""
+Compile a configuration into a static settings module.
+
+Example: python -m configurations freeze --configuration=Prod -o settings_prod.py
+"""
+import decimal
+import math
+import os
+import pathlib
+import re
+import sys
+from importlib import import_module
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import translation
+from django.utils.functional import Promise
+
+from .importer import SETTINGS_ENVIRONMENT_VARIABLE
+from .utils import isuppercase
+
+header = '''\
+# Generated by "python -m configurations freeze" from the configuration
+# {configuration}. Do not edit, your changes will be overwritten.
+'''
+
+
+class Unfreezable(ValueError):
+    pass
+
+
+class SettingsRenderer:
+    """
+    Renders setting values as Python source, collecting the imports the
+    rendered source requires.
+    """
+    def __init__(self, settings_module):
+        self.settings_module = settings_module
+        self.imports = set()
+
+    def render(self, value):
+        kind = type(value)
+        if value is None or kind in (bool, int, str, bytes):
+            return repr(value)
+        if isinstance(value, Promise):
+            return self.render_promise(value)
+        if kind is float:
+            if math.isfinite(value):
+                return repr(value)
+            return f'float({str(value)!r})'
+        if kind is list:
+            return '[{}]'.format(', '.join(map(self.render, value)))
+        if kind is tuple:
+            items = [self.render(item) for item in value]
+            if len(items) == 1:
+                return f'({items[0]},)'
+            return '({})'.format(', '.join(items))
+        if kind in (set, frozenset):
+            items = ', '.join(sorted(map(self.render, value)))
+            if kind is set and items:
+                return f'{{{items}}}'
+            return f'{kind.__name__}([{items}])' if items else f'{kind.__name__}()'
+        if kind is dict:
+            return '{{{}}}'.format(', '.join(
+                f'{self.render(key)}: {self.render(item)}'
+                for key, item in value.items()))
+        if isinstance(value, decimal.Decimal):
+            self.imports.add('decimal')
+            return f'decimal.Decimal({str(value)!r})'
+        if isinstance(value, pathlib.PurePath):
+            self.imports.add('pathlib')
+            return f'pathlib.{type(value).__name__}({str(value)!r})'
+        if isinstance(value, re.Pattern):
+            self.imports.add('re')
+            return f're.compile({value.pattern!r}, {value.flags!r})'
+        return self.render_reference(value)
+
+    def render_promise(self, value):
+        """
+        Renders a lazy object, e.g. of ``gettext_lazy``, as the call that
+        created it without evaluating it, since translations aren't
+        available before the apps are loaded.
+        """
+        try:
+            _, (func, args, kwargs, *resultclasses) = value.__reduce__()
+        except (TypeError, ValueError) as err:
+            raise Unfreezable(f'the lazy object {type(value)!r} '
+                              f"can't be rendered") from err
+        arguments = [self.render(arg) for arg in args]
+        arguments.extend(f'{key}={self.render(item)}'
+                         for key, item in kwargs.items())
+        # e.g. gettext_lazy for lazy objects of gettext
+        name = getattr(func, '__name__', '')
+        if (getattr(translation, name, None) is func
+                and hasattr(translation, f'{name}_lazy')
+                and resultclasses == [str]):
+            self.imports.add(translation.__name__)
+            function = f'{translation.__name__}.{name}_lazy'
+        else:
+            self.imports.add('django.utils.functional')
+            function = 'django.utils.functional.lazy({})'.format(', '.join(
+                map(self.render_reference, [func, *resultclasses])))
+        return f'{function}({", ".join(arguments)})'
+
+    def render_reference(self, value):
+        try:
+            return self.import_path(value)
+        except Unfreezable:
+            raise
+        except Exception as err:
+            raise Unfreezable(f'{type(value)!r} is not importable: '
+                              f'{err!r}') from err
+
+    def import_path(self, value):
+        module = getattr(value, '__module__', None)
+        qualname = getattr(value, '__qualname__', None)
+        if not module or not qualname or '<' in qualname:
+            raise Unfreezable(f'{value!r} is not importable')
+        if module == self.settings_module:
+            raise Unfreezable(f'{value!r} is defined in the settings module')
+        path = f'{module}.{qualname}'
+        try:
+            imported = import_module(module)
+            for attr in qualname.split('.'):
+                imported = getattr(imported, attr)
+        except (ImportError, AttributeError):
+            imported = None
+        if imported is not value:
+            raise Unfreezable(f'{value!r} is not importable as {path!r}')
+        self.imports.add(module)
+        return path
+
+
+def freeze(module, exclude=()):
+    """
+    Return the source of a settings module with the uppercase attributes
+    of the given, already set up, settings module as literal assignments.
+    """
+    renderer = SettingsRenderer(module.__name__)
+    lines = []
+    for name in sorted(dir(module)):
+        if not isuppercase(name) or name in exclude:
+            continue
+        try:
+            lines.append(f'{name} = {renderer.render(getattr(module, name))}')
+        except Unfreezable as err:
+            raise Unfreezable(f"Setting {name!r} can't be frozen: {err}") from err
+    configuration = getattr(module, 'CONFIGURATION', module.__name__)
+    source = [header.format(configuration=configuration)]
+    if renderer.imports:
+        source.append(''.join(f'import {name}\n'
+                              for name in sorted(renderer.imports)))
+    source.append('\n'.join(lines) + '\n')
+    return '\n'.join(source)
+
+
+class Command(BaseCommand):
+    help = ('Writes the settings of a configuration as a static settings '
+            'module that can be used without django-configurations.')
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument('-o', '--output',
+                            help='The file to write the settings module to, '
+                                 'defaults to the standard output.')
+        parser.add_argument('--exclude', action='append', default=[],
+                            metavar='SETTING',
+                            help='A setting to leave out of the settings '
+                                 'module, e.g. "SECRET_KEY". Can be used '
+                                 'multiple times.')
+
+    def handle(self, output=None, exclude=(), **options):
+        module_name = os.environ.get(SETTINGS_ENVIRONMENT_VARIABLE)
+        module = sys.modules.get(module_name) or import_module(module_name)
+        try:
+            source = freeze(module, exclude=exclude)
+        except Unfreezable as err:
+            raise CommandError(err) from err
+        if output is None:
+            return source
+        with open(output, 'w') as fp:
+            fp.write(source)
@@ -0,0 +1,21 @@
+"""
+Server hooks for gunicorn that set up the configuration once in the master
+process and only set up the values marked with ``per_worker`` again in each
+worker. Use the module as the configuration file::
+
+    gunicorn -c python:configurations.gunicorn mysite.wsgi
+
+or import the hooks in your own configuration file::
+
+    from configurations.gunicorn import on_starting, post_fork  # noqa
+"""
+from . import prefork
+
+
+def on_starting(server):
+    prefork.setup()
+
+
+def post_fork(server, worker):
+    # the age of a worker is unique among the workers of the master
+    prefork.after_fork(worker.age)
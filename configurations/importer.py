@@ -2,17 +2,29 @@ from importlib.machinery import PathFinder
 import logging
 import os
 import sys
+import threading
+import weakref
+from contextlib import nullcontext
 from optparse import OptionParser, make_option
 
 from django.conf import ENVIRONMENT_VARIABLE as SETTINGS_ENVIRONMENT_VARIABLE
 from django.core.exceptions import ImproperlyConfigured
 from django.core.management import base
 
-from .utils import uppercase_attributes, reraise
-from .values import Value, setup_value
+from . import cache, prefetch, profiler
+from .base import (computed_dependencies, environments, evaluation,
+                   reload_dotenv, resolved_values)
+from .signals import settings_refreshed
+from .utils import SingleFlight, isuppercase, reraise
+from .values import Environment, Value, resolving, setup_value
 
 installed = False
 
+# the settings module, configuration instance and lazy settings, if any,
+# of each configuration class the importer set up
+configured = weakref.WeakKeyDictionary()
+_refresh_lock = threading.Lock()
+
 CONFIGURATION_ENVIRONMENT_VARIABLE = 'DJANGO_CONFIGURATION'
 CONFIGURATION_ARGUMENT = '--configuration'
 CONFIGURATION_ARGUMENT_HELP = ('The name of the configuration class to load, '
@@ -25,7 +37,7 @@ configuration_options = (make_option(CONFIGURATION_ARGUMENT,
                                      help=CONFIGURATION_ARGUMENT_HELP),)
 
 
-def install(check_options=False):
+def install(check_options=False, settle=False):
     global installed
     if not installed:
         orig_create_parser = base.BaseCommand.create_parser
@@ -46,7 +58,10 @@ def install(check_options=False):
             return parser
 
         base.BaseCommand.create_parser = create_parser
-        importer = ConfigurationFinder(check_options=check_options)
+        if os.environ.get(profiler.PROFILE_ENVIRONMENT_VARIABLE):
+            profiler.enable()
+        importer = ConfigurationFinder(check_options=check_options,
+                                       settle=settle)
         sys.meta_path.insert(0, importer)
         installed = True
 
@@ -57,7 +72,14 @@ class ConfigurationFinder(PathFinder):
     error_msg = ("Configuration cannot be imported, "
                  "environment variable {0} is undefined.")
 
-    def __init__(self, check_options=False):
+    def __init__(self, check_options=False, settle=False):
+        # one loader per settings module, path and configuration class
+        self.loaders = {}
+        # once a settling finder has found the settings module, it only
+        # handles (re)imports of that module and doesn't look up the
+        # environment for other imports anymore
+        self.settle = settle
+        self.found = None
         self.argv = sys.argv[:]
         self.logger = logging.getLogger(__name__)
         self.logger.setLevel(logging.DEBUG)
@@ -127,54 +149,274 @@ class ConfigurationFinder(PathFinder):
                 self.logger.debug(stylize(message))
 
     def find_spec(self, fullname, path=None, target=None):
-        if fullname is not None and fullname == self.module:
-            spec = super().find_spec(fullname, path, target)
-            if spec is not None:
-                wrap_loader(spec.loader, self.name)
-                return spec
-        else:
+        module = self.found
+        if module is None:
+            module = self.module
+        if fullname is None or fullname != module:
             return None
+        spec = super().find_spec(fullname, path, target)
+        if spec is not None:
+            key = (fullname, spec.origin, self.name)
+            loader = self.loaders.get(key)
+            if loader is None:
+                loader = self.loaders[key] = ConfigurationLoader(
+                    spec.loader, self.name)
+            spec.loader = loader
+            if self.settle:
+                self.found = fullname
+        return spec
+
+
+def setup_setting(module, obj, name):
+    """
+    Sets the module attribute of the given setting to the value of the
+    configuration instance's attribute, calling it if needed.
+    """
+    with profiler.measure('setting', name):
+        value = getattr(obj, name)
+    if callable(value) and not getattr(value, 'pristine', False):
+        with profiler.measure('computed', name):
+            value = value()
+        # in case a method returns a Value instance we have
+        # to do the same as the Configuration.setup method
+        if isinstance(value, Value):
+            setup_value(module, name, value)
+            return
+    setattr(module, name, value)
+
+
+class LazySettings:
+    """
+    Sets up the values and computed settings of a configuration when the
+    settings module attribute is first accessed, using the module level
+    ``__getattr__`` and ``__dir__`` functions of PEP 562.
+    """
+    def __init__(self, module, obj, cls_path, environment=None):
+        self.module = module
+        self.obj = obj
+        self.cls_path = cls_path
+        self.environment = environment
+        # one thread sets up each setting, the others wait for it
+        self.setting_up = SingleFlight()
+        cls = type(obj)
+        self.pending = set(cls._pending_values()) | set(cls.computed_settings())
+
+    def install(self):
+        for name in dir(self.obj):
+            if isuppercase(name) and name not in self.pending:
+                setup_setting(self.module, self.obj, name)
+        self.module.__getattr__ = self.getattr
+        self.module.__dir__ = self.dir
+
+    def getattr(self, name):
+        if name in self.pending:
+            with self.setting_up(name):
+                if name in self.pending:
+                    self.resolve(name)
+        try:
+            return self.module.__dict__[name]
+        except KeyError:
+            raise AttributeError(f"module {self.module.__name__!r} "
+                                 f"has no attribute {name!r}") from None
 
+    def dir(self):
+        return sorted(set(self.module.__dict__) | self.pending)
 
-def wrap_loader(loader, class_name):
-    class ConfigurationLoader(loader.__class__):
-        def exec_module(self, module):
-            super().exec_module(module)
+    def resolve(self, name):
+        try:
+            with resolving(self.environment):
+                setup_setting(self.module, self.obj, name)
+        except AttributeError as err:
+            # an AttributeError would look like a missing setting
+            raise ImproperlyConfigured(
+                f"Couldn't setup setting {name!r} of configuration "
+                f"'{self.cls_path}': {err}") from err
+        except Exception as err:
+            reraise(err, f"Couldn't setup setting {name!r} of "
+                         f"configuration '{self.cls_path}'")
+        self.pending.discard(name)
+
+
+def refresh(cls, names=None):
+    """
+    Sets up the values of the configuration class whose environment
+    variables changed again, or the values with the given names, as well
+    as the computed settings using them, and updates the settings module
+    and Django's settings. Returns the changed settings by name as tuples
+    of the old and the new value.
+    """
+    try:
+        module, obj, lazy = configured[cls]
+    except KeyError:
+        raise ImproperlyConfigured(
+            f"Can't refresh {cls!r}, it wasn't set up by the importer")
+    with _refresh_lock, (lazy.setting_up.exclusive() if lazy
+                         else nullcontext()):
+        values = resolved_values.get(cls, {})
+        if names is not None:
+            for name in names:
+                if name not in values:
+                    raise ImproperlyConfigured(
+                        f"Can't refresh setting {name!r} of {cls!r}, it "
+                        f"isn't a value that was set up")
+            values = {name: values[name] for name in names}
+        else:
+            reload_dotenv(cls)
+        previous = environments[cls]
+        environment = environments[cls] = Environment(os.environ)
+        environment.used.update(previous.used)
+        environment.prefixes.update(previous.prefixes)
+        if lazy:
+            lazy.environment = environment
+
+        stale = set()
+        if names is None and environment == previous:
+            # comparing the whole environment is faster than each variable
+            values = {}
+        with resolving(environment):
+            for name, value in sorted(values.items()):
+                if names is None:
+                    if not value.environ:
+                        continue
+                    environ_name = value.full_environ_name(name)
+                    if (previous.get(environ_name)
+                            == environment.get(environ_name)):
+                        continue
+                setup_value(cls, name, value)
+                stale.add(name)
+                if value.multiple:
+                    stale.update(value.value)
+
+        # the computed settings using the changed settings, directly or
+        # through other computed settings
+        state = evaluation(obj)
+        dependents = {}
+        for name, dependencies in computed_dependencies(cls).items():
+            for dependency in dependencies:
+                dependents.setdefault(dependency, set()).add(name)
+        pending = list(stale)
+        while pending:
+            for name in dependents.get(pending.pop(), ()):
+                if name not in stale:
+                    stale.add(name)
+                    pending.append(name)
+        for name in stale:
+            state.results.pop(name, None)
+
+        changes = {}
+        with resolving(environment):
+            for name in sorted(stale):
+                if lazy and name in lazy.pending:
+                    continue
+                old = module.__dict__.get(name)
+                setup_setting(module, obj, name)
+                new = module.__dict__.get(name)
+                if old != new:
+                    changes[name] = (old, new)
+
+    from django.conf import settings
+    if (changes and settings.configured
+            and getattr(settings, 'SETTINGS_MODULE', None) == module.__name__):
+        for name, (old, new) in changes.items():
+            setattr(settings, name, new)
+    if changes:
+        settings_refreshed.send(sender=cls, changes=changes)
+    return changes
+
+
+class ConfigurationLoader:
+    """
+    Executes the settings module with the wrapped loader and sets up the
+    configuration class in it. Everything else, e.g. ``get_source``, is
+    delegated to the wrapped loader.
+
+    The finder reuses one instance per settings module and configuration
+    class, so reloading the settings module doesn't create a loader class.
+    """
+    def __init__(self, loader, class_name):
+        self.loader = loader
+        self.class_name = class_name
+
+    def __getattr__(self, name):
+        if name == 'loader':
+            raise AttributeError(name)
+        return getattr(self.loader, name)
 
-            mod = module
+    def __repr__(self):
+        return f'<{type(self).__name__} {self.class_name!r} {self.loader!r}>'
+
+    def create_module(self, spec):
+        return self.loader.create_module(spec)
+
+    def exec_module(self, module):
+        with profiler.measure('module', module.__name__):
+            cls = self.exec_configuration(module)
+        if cls is not None and os.environ.get('RUN_MAIN') == 'true':
+            # refresh the settings when a .env file changes under the
+            # autoreloader of runserver instead of restarting the server
+            from . import autoreload
+            autoreload.watch(cls)
+        if os.environ.get(profiler.PROFILE_ENVIRONMENT_VARIABLE):
+            profiler.report()
+
+    def exec_configuration(self, module):
+        """
+        Executes the module and sets up the configuration class, returning
+        it or None if the settings were restored from a snapshot.
+        """
+        class_name = self.class_name
+        snapshot = cache.get_snapshot(module.__name__, class_name)
+        if snapshot is not None and snapshot.restore(module):
+            return None
+
+        self.loader.exec_module(module)
+
+        mod = module
 
-            cls_path = f'{mod.__name__}.{class_name}'
+        cls_path = f'{mod.__name__}.{class_name}'
 
-            try:
-                cls = getattr(mod, class_name)
-            except AttributeError as err:  # pragma: no cover
-                reraise(
-                    err,
-                    (
-                        f"Couldn't find configuration '{class_name}' in "
-                        f"module '{mod.__package__}'"
-                    ),
-                )
-            try:
+        try:
+            cls = getattr(mod, class_name)
+        except AttributeError as err:  # pragma: no cover
+            reraise(
+                err,
+                (
+                    f"Couldn't find configuration '{class_name}' in "
+                    f"module '{mod.__package__}'"
+                ),
+            )
+        try:
+            with profiler.measure('pre_setup', cls_path):
                 cls.pre_setup()
-                cls.setup()
+            # set up all values from one snapshot of the environment,
+            # including the variables of the loaded .env files
+            environment = environments[cls] = Environment(os.environ)
+            with resolving(environment):
+                if getattr(cls, 'PREFETCH_VALUES', False):
+                    prefetch.start(cls)
+                with profiler.measure('setup', cls_path):
+                    cls.setup()
                 obj = cls()
-                attributes = uppercase_attributes(obj).items()
-                for name, value in attributes:
-                    if callable(value) and not getattr(value, 'pristine', False):
-                        value = value()
-                        # in case a method returns a Value instance we have
-                        # to do the same as the Configuration.setup method
-                        if isinstance(value, Value):
-                            setup_value(mod, name, value)
-                            continue
-                    setattr(mod, name, value)
-
-                setattr(mod, 'CONFIGURATION', '{0}.{1}'.format(module.__name__,
-                                                               class_name))
-                cls.post_setup()
-
-            except Exception as err:
-                reraise(err, f"Couldn't setup configuration '{cls_path}'")
-
-    loader.__class__ = ConfigurationLoader
+                lazy = getattr(cls, 'LAZY_SETTINGS', False)
+                if lazy:
+                    lazy = LazySettings(mod, obj, cls_path, environment)
+                    lazy.install()
+                else:
+                    for name in dir(obj):
+                        if isuppercase(name):
+                            setup_setting(mod, obj, name)
+                configured[cls] = (mod, obj, lazy or None)
+
+                setattr(mod, 'CONFIGURATION', '{0}.{1}'.format(
+                    module.__name__, class_name))
+                with profiler.measure('post_setup', cls_path):
+                    cls.post_setup()
+            if getattr(cls, 'DROP_VALUES', False) and not lazy:
+                cls.drop_values()
+
+        except Exception as err:
+            reraise(err, f"Couldn't setup configuration '{cls_path}'")
+
+        if snapshot is not None:
+            snapshot.save(module, cls)
+        return cls
@@ -1,6 +1,28 @@
+import sys
+
 from . import importer
 
 importer.install(check_options=True)
 
-from django.core.management import (execute_from_command_line,  # noqa
-                                    call_command)
+from django.core.management import call_command  # noqa
+from django.core.management import (  # noqa
+    execute_from_command_line as django_execute_from_command_line)
+from django.utils.module_loading import import_string  # noqa: E402
+
+commands = {
+    'freeze': 'configurations.freeze.Command',
+    'profile': 'configurations.profile.Command',
+}
+
+
+def execute_from_command_line(argv=None):
+    """
+    Runs one of django-configurations' own commands (e.g. ``freeze``) or
+    else hands over to Django's ``execute_from_command_line``.
+    """
+    argv = sys.argv[:] if argv is None else argv
+    if len(argv) > 1 and argv[1] in commands:
+        command = import_string(commands[argv[1]])()
+        command.run_from_argv(argv)
+    else:
+        django_execute_from_command_line(argv)
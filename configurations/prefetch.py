@@ -0,0 +1,81 @@
+"""
+Setting up the values of a configuration in background threads while the
+rest of the configuration is set up, enabled with ``PREFETCH_VALUES``.
+"""
+import contextvars
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+from . import profiler
+from .values import setting_up
+
+# the values of each configuration class being set up in the background
+prefetching = weakref.WeakKeyDictionary()
+
+max_workers = 8
+
+
+class Prefetch:
+    """
+    Sets up the given values in a thread pool, each of them is joined when
+    the setting is first needed.
+    """
+    def __init__(self, values):
+        self.futures = {}
+        # the settings that weren't joined yet
+        self.pending = set(values)
+        if not values:
+            return
+        executor = ThreadPoolExecutor(
+            max_workers=min(max_workers, len(values)),
+            thread_name_prefix='configurations-prefetch')
+        for name, value in values.items():
+            # run in the context of the importer, e.g. the environment
+            context = contextvars.copy_context()
+            self.futures[name] = executor.submit(context.run, self.setup,
+                                                 name, value)
+        # the threads exit once all values are set up
+        executor.shutdown(wait=False)
+
+    @staticmethod
+    def setup(name, value):
+        start = time.perf_counter()
+        # threads reading the value meanwhile wait instead of setting it up
+        with setting_up(id(value)), profiler.measure('value', name, value):
+            actual_value = value.setup(name)
+        return actual_value, time.perf_counter() - start
+
+    def __contains__(self, name):
+        return name in self.futures
+
+    def join(self, name):
+        """
+        Returns the set up value of the setting, waiting for it if needed.
+        Several threads may join the same setting.
+        """
+        future = self.futures[name]
+        start = time.perf_counter()
+        with profiler.measure('prefetch', name):
+            actual_value, duration = future.result()
+        try:
+            self.pending.remove(name)
+        except KeyError:
+            # joined by another thread as well
+            return actual_value
+        profile = profiler.active()
+        if profile is not None:
+            # the time this thread would have spent setting up the value
+            profile.add_saved(duration - (time.perf_counter() - start))
+        return actual_value
+
+
+def start(cls):
+    """
+    Starts setting up the values of the configuration class that can be
+    set up in the background.
+    """
+    values = {name: value for name, value in cls._pending_values().items()
+              if value.prefetch}
+    prefetch = prefetching[cls] = Prefetch(values)
+    return prefetch
@@ -0,0 +1,90 @@
+"""
+Preparing the master process of a pre-forking application server, so that
+the workers share as much memory with it as possible and don't import or
+set up anything on their first request.
+
+See :mod:`configurations.wsgi_prefork` for a WSGI application doing that
+and :mod:`configurations.gunicorn` for the server hooks of gunicorn.
+"""
+import gc
+import os
+from importlib import import_module
+
+from .profiler import measure
+
+# set to the id of the worker before the per-worker values are set up again
+WORKER_ENVIRONMENT_VARIABLE = 'DJANGO_WORKER_ID'
+
+
+def setup():
+    """
+    Installs the importer and imports the settings module, so that the
+    workers forked afterwards inherit the set up configuration.
+    """
+    from . import importer
+
+    importer.install(settle=True)
+    import_module(os.environ[importer.SETTINGS_ENVIRONMENT_VARIABLE])
+
+
+def after_fork(worker_id=None):
+    """
+    Sets up the values marked with ``per_worker`` again in a forked worker,
+    as well as the computed settings using them, after setting the
+    ``DJANGO_WORKER_ID`` environment variable to the given id. Returns the
+    changed settings.
+    """
+    from .base import resolved_values
+    from .importer import configured
+
+    if worker_id is not None:
+        os.environ[WORKER_ENVIRONMENT_VARIABLE] = str(worker_id)
+    changes = {}
+    for cls in list(configured):
+        names = [name for name, value in resolved_values.get(cls, {}).items()
+                 if value.per_worker]
+        if names:
+            with measure('after_fork', f'{cls.__module__}.{cls.__name__}'):
+                changes.update(cls.refresh(names))
+    return changes
+
+
+def warm_up(urls=True, templates=True, translations=True):
+    """
+    Sets up what the first request would otherwise, after ``django.setup()``
+    imported the installed apps: the root URLconf and the views it imports,
+    the template loaders of each template engine and the translations of
+    the default language.
+    """
+    from django.conf import settings
+
+    if urls:
+        with measure('warm_up', 'urls'):
+            from django.urls import get_resolver
+
+            get_resolver().reverse_dict
+    if templates:
+        with measure('warm_up', 'templates'):
+            from django.template import engines
+
+            for engine in engines.all():
+                # only the Django template engine has template loaders
+                getattr(getattr(engine, 'engine', None), 'template_loaders',
+                        None)
+    if translations and settings.USE_I18N:
+        with measure('warm_up', 'translations'):
+            from django.utils.translation import trans_real
+
+            trans_real.translation(settings.LANGUAGE_CODE)
+
+
+def freeze():
+    """
+    Collects the garbage and moves all other objects to the permanent
+    generation of the garbage collector, so that collections in the forked
+    workers don't write to, and thereby copy, the memory pages they share
+    with the master process.
+    """
+    with measure('warm_up', 'gc.freeze'):
+        gc.collect()
+        gc.freeze()
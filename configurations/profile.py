@@ -0,0 +1,58 @@
+"""
+Report how long setting up a configuration takes, step by step.
+
+Example: python -m configurations profile --configuration=Prod --limit=20
+"""
+import os
+import sys
+import tracemalloc
+from importlib import import_module
+
+from django.core.management.base import BaseCommand, CommandError
+
+from . import profiler
+from .importer import (CONFIGURATION_ENVIRONMENT_VARIABLE,
+                       SETTINGS_ENVIRONMENT_VARIABLE)
+
+
+class Command(BaseCommand):
+    help = ('Sets up a configuration and reports the time spent in each '
+            'step, slowest first.')
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int,
+                            help='The number of steps to report, defaults '
+                                 'to all of them.')
+        parser.add_argument('--memory', action='store_true',
+                            help='Also report the memory allocated while '
+                                 'setting up the configuration and the '
+                                 'size of the largest settings, which slows '
+                                 'down the set up.')
+
+    def handle(self, limit=None, memory=False, **options):
+        module_name = os.environ.get(SETTINGS_ENVIRONMENT_VARIABLE)
+        if module_name in sys.modules:
+            raise CommandError(f'The settings module {module_name!r} has '
+                               f'already been set up, nothing to profile.')
+        if memory:
+            tracemalloc.start()
+        profile = profiler.enable()
+        try:
+            module = import_module(module_name)
+        finally:
+            profiler.disable()
+            if memory:
+                allocated = tracemalloc.get_traced_memory()[0]
+                tracemalloc.stop()
+        profile.report(stream=self.stdout, limit=limit)
+        # the configuration class is missing if a snapshot was restored
+        configuration = getattr(
+            module, os.environ[CONFIGURATION_ENVIRONMENT_VARIABLE], None)
+        if configuration is not None and configuration.unused_environ():
+            self.stdout.write(f'\nUnused environment variables: '
+                              f'{", ".join(configuration.unused_environ())}')
+        if memory:
+            self.stdout.write(f'\nAllocated while setting up, including '
+                              f'imported modules: {allocated / 1024:.1f} KiB')
+            profiler.report_memory(module, stream=self.stdout, limit=limit)
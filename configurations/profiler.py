@@ -0,0 +1,226 @@
+"""
+Timing of the steps of setting up a configuration.
+
+See :mod:`configurations.profile` for the ``profile`` command. Use it as a
+library to report the timings from any other entry point::
+
+    from configurations import profiler
+
+    profiler.enable()
+    application = get_wsgi_application()
+    profiler.report()
+
+Setting the ``DJANGO_CONFIGURATION_PROFILE`` environment variable does the
+same, writing the report to the standard error after the settings module
+has been set up.
+
+:func:`report_memory` reports the memory taken up by the settings of a
+settings module and by the :class:`~configurations.values.Value` objects
+still alive, e.g. in each worker of an application server, and
+:func:`process_memory` the memory of a whole process.
+"""
+import gc
+import sys
+import threading
+import time
+import types
+from contextlib import contextmanager
+
+from .utils import isuppercase
+
+PROFILE_ENVIRONMENT_VARIABLE = 'DJANGO_CONFIGURATION_PROFILE'
+
+_active = None
+
+
+class Entry:
+
+    def __init__(self, kind, name, environ_name=None, value_class=None):
+        self.kind = kind
+        self.name = name
+        self.environ_name = environ_name
+        self.value_class = value_class
+        self.calls = 0
+        self.total = 0.0
+
+
+class Profiler:
+    """
+    Collects the wall time and number of calls of each step by kind and
+    name. The times of nested steps are included in the outer steps.
+    """
+    def __init__(self):
+        self.entries = {}
+        self.saved = 0.0
+        self.lock = threading.Lock()
+
+    def add(self, kind, name, duration, value=None):
+        key = (kind, name)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                environ_name = value_class = None
+                if value is not None:
+                    value_class = type(value).__name__
+                    if value.environ:
+                        environ_name = value.full_environ_name(name)
+                entry = self.entries[key] = Entry(kind, name, environ_name,
+                                                  value_class)
+            entry.calls += 1
+            entry.total += duration
+
+    def add_saved(self, duration):
+        """
+        Adds the wall time saved by doing work in the background.
+        """
+        with self.lock:
+            self.saved += duration
+
+    def sorted_entries(self):
+        return sorted(self.entries.values(), key=lambda entry: -entry.total)
+
+    def report(self, stream=None, limit=None):
+        stream = sys.stderr if stream is None else stream
+        entries = self.sorted_entries()[:limit]
+        rows = [('ms', 'calls', 'kind', 'name', 'environ', 'class')]
+        for entry in entries:
+            rows.append((f'{entry.total * 1000:.3f}', str(entry.calls),
+                         entry.kind, entry.name, entry.environ_name or '',
+                         entry.value_class or ''))
+        widths = [max(len(row[column]) for row in rows)
+                  for column in range(len(rows[0]))]
+        for row in rows:
+            cells = [row[0].rjust(widths[0]), row[1].rjust(widths[1])]
+            cells.extend(cell.ljust(width)
+                         for cell, width in zip(row[2:], widths[2:]))
+            stream.write('  '.join(cells).rstrip() + '\n')
+        if self.saved:
+            stream.write(f'\nSaved by setting up values in the background: '
+                         f'{self.saved * 1000:.3f} ms\n')
+
+
+@contextmanager
+def measure(kind, name, value=None):
+    """
+    Measures the wall time of the block with the active profiler, if any.
+    """
+    profiler = _active
+    if profiler is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        profiler.add(kind, name, time.perf_counter() - start, value)
+
+
+def enable():
+    """
+    Starts collecting timings in a new profiler and returns it.
+    """
+    global _active
+    _active = Profiler()
+    return _active
+
+
+def disable():
+    global _active
+    profiler, _active = _active, None
+    return profiler
+
+
+def active():
+    return _active
+
+
+def report(stream=None, limit=None):
+    """
+    Writes the report of the active profiler.
+    """
+    if _active is not None:
+        _active.report(stream=stream, limit=limit)
+
+
+# objects a setting refers to but that aren't part of its footprint
+shared_types = (type, types.ModuleType, types.FunctionType,
+                types.BuiltinFunctionType, types.MethodType)
+
+
+def deep_size(obj, seen):
+    """
+    Returns the size in bytes of the object and the objects it refers to,
+    skipping the ids in ``seen`` and adding the ones it counted.
+    """
+    size = 0
+    stack = [obj]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen or isinstance(obj, shared_types):
+            continue
+        seen.add(id(obj))
+        size += sys.getsizeof(obj)
+        stack.extend(gc.get_referents(obj))
+    return size
+
+
+def settings_footprint(module):
+    """
+    Returns the size in bytes of each uppercase setting of the module by
+    name, largest first. Objects shared between settings are counted for
+    the first of them in alphabetical order.
+    """
+    seen = set()
+    sizes = {name: deep_size(getattr(module, name), seen)
+             for name in sorted(dir(module)) if isuppercase(name)}
+    return dict(sorted(sizes.items(), key=lambda item: -item[1]))
+
+
+def values_footprint():
+    """
+    Returns the number and size in bytes of the ``Value`` objects alive.
+    """
+    from .values import Value
+
+    alive = [obj for obj in gc.get_objects() if isinstance(obj, Value)]
+    seen = set()
+    return len(alive), sum(deep_size(value, seen) for value in alive)
+
+
+def report_memory(module, stream=None, limit=None):
+    """
+    Writes the memory footprint of the settings of the module and the
+    ``Value`` objects alive, listing the largest settings.
+    """
+    stream = sys.stderr if stream is None else stream
+    sizes = settings_footprint(module)
+    count, values_size = values_footprint()
+    stream.write(f'{len(sizes)} settings: {sum(sizes.values()) / 1024:.1f} '
+                 f'KiB\n')
+    stream.write(f'{count} Value objects alive: {values_size / 1024:.1f} '
+                 f'KiB\n')
+    items = list(sizes.items())[:limit]
+    if items:
+        width = max(len(name) for name, _ in items)
+        for name, size in items:
+            stream.write(f'{name.ljust(width)}  {size / 1024:10.1f} KiB\n')
+
+
+def process_memory(pid='self'):
+    """
+    Returns the resident, proportional, shared and private memory of the
+    process in KiB, by the field names of ``/proc/<pid>/smaps_rollup``,
+    e.g. ``Private_Dirty``, or None if that isn't available, e.g. on other
+    platforms than Linux.
+    """
+    try:
+        with open(f'/proc/{pid}/smaps_rollup') as fp:
+            lines = fp.readlines()
+    except OSError:
+        return None
+    memory = {}
+    for line in lines[1:]:
+        name, _, size = line.partition(':')
+        if size.strip().endswith('kB'):
+            memory[name] = int(size.split()[0])
+    return memory
@@ -0,0 +1,6 @@
+from django.dispatch import Signal
+
+# sent by Configuration.refresh() with the configuration class as sender
+# and the changed settings as ``changes``, a dictionary of setting names
+# to tuples of the old and the new value
+settings_refreshed = Signal()
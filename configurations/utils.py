@@ -1,7 +1,9 @@
 import inspect
 import sys
+import threading
 import warnings
 
+from contextlib import contextmanager
 from functools import partial
 from importlib import import_module
 
@@ -16,6 +18,68 @@ def uppercase_attributes(obj):
     return {name: getattr(obj, name) for name in dir(obj) if isuppercase(name)}
 
 
+class SingleFlight:
+    """
+    Lets one thread at a time do the work for a key, e.g. set up a value,
+    while the other threads using the same key wait for it to finish.
+    Callers check for the published result before and again within the
+    block, so reading it afterwards doesn't take a lock::
+
+        flights = SingleFlight()
+
+        if name in pending:
+            with flights(name):
+                if name in pending:
+                    resolve(name)
+
+    The lock of a key is reentrant and only kept while threads use it.
+    """
+    def __init__(self):
+        # the lock and number of threads using it by key
+        self.flights = {}
+        self.condition = threading.Condition()
+        self.owner = None
+
+    def __contains__(self, key):
+        return key in self.flights
+
+    @contextmanager
+    def __call__(self, key):
+        with self.condition:
+            while self.owner not in (None, threading.get_ident()):
+                self.condition.wait()
+            flight = self.flights.get(key)
+            if flight is None:
+                flight = self.flights[key] = [threading.RLock(), 0]
+            flight[1] += 1
+        try:
+            with flight[0]:
+                yield
+        finally:
+            with self.condition:
+                flight[1] -= 1
+                if not flight[1]:
+                    del self.flights[key]
+                    self.condition.notify_all()
+
+    @contextmanager
+    def exclusive(self):
+        """
+        Waits for the other threads to finish and keeps them from starting
+        until the end of the block.
+        """
+        with self.condition:
+            self.condition.wait_for(
+                lambda: self.owner is None and not self.flights)
+            self.owner = threading.get_ident()
+        try:
+            yield
+        finally:
+            with self.condition:
+                self.owner = None
+                self.condition.notify_all()
+
+
 def import_by_path(dotted_path, error_prefix=''):
     """
     Import a dotted module path and return the attribute/class designated by
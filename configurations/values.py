@@ -1,18 +1,270 @@
 import ast
+import asyncio
 import copy
 import decimal
+import importlib.util
+import inspect
 import os
 import sys
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache, wraps
 
 from django.core import validators
 from django.core.exceptions import ValidationError, ImproperlyConfigured
 from django.utils.module_loading import import_string
 
-from .utils import getargspec
+from .profiler import measure
+from .utils import SingleFlight, getargspec
 
+_unset = object()
 
-def setup_value(target, name, value):
-    actual_value = value.setup(name)
+# the values being set up by id, one thread at a time for each of them
+setting_up = SingleFlight()
+
+
+# the arguments of Value.__init__, which aren't passed on to casters
+value_arguments = {'default', 'environ', 'environ_name', 'environ_prefix',
+                   'environ_required', 'late_binding', 'per_worker',
+                   'prefetch', 'resolver'}
+
+# casters and validators by dotted path, the argument names of casters
+# and the dotted paths known to be importable
+_imported = {}
+_argument_names = {}
+_importable = set()
+
+
+def check_importable(dotted_path):
+    """
+    Raises ImproperlyConfigured if the module of the dotted path can't be
+    found, without importing it.
+    """
+    if dotted_path in _imported or dotted_path in _importable:
+        return
+    module_path = dotted_path.rpartition('.')[0]
+    try:
+        spec = module_path and importlib.util.find_spec(module_path)
+    except (ImportError, ValueError):
+        spec = None
+    if not spec:
+        raise ImproperlyConfigured(f"Could not import {dotted_path!r}")
+    _importable.add(dotted_path)
+
+
+def import_cached(dotted_path):
+    """
+    Imports a caster or validator once per process.
+    """
+    try:
+        return _imported[dotted_path]
+    except KeyError:
+        pass
+    try:
+        imported = import_string(dotted_path)
+    except ImportError as err:
+        raise ImproperlyConfigured(f"Could not import {dotted_path!r}") from err
+    _imported[dotted_path] = imported
+    return imported
+
+
+def argument_names(caster):
+    """
+    Returns the names of the arguments of the caster, once per caster
+    function.
+    """
+    key = getattr(caster, '__func__', caster)
+    try:
+        return _argument_names[key]
+    except KeyError:
+        pass
+    except TypeError:
+        # unhashable callables aren't cached
+        key = None
+    try:
+        names = frozenset(getargspec(caster)[0])
+    except TypeError:
+        names = frozenset()
+    if key is not None:
+        _argument_names[key] = names
+    return names
+
+
+def copy_environ(environ):
+    """
+    Returns a copy of the variables of the environment mapping, along with
+    the functions to encode a name to look it up in the copy and to decode
+    the names and values of the copy.
+
+    For :data:`os.environ` its encoded variables are copied, which is much
+    faster than decoding all of them (about 2µs instead of 200µs for 200
+    variables), and only the looked up variables are decoded. This uses
+    the ``_data``, ``encodekey``, ``decodekey`` and ``decodevalue``
+    attributes of ``os._Environ``, which aren't public but haven't changed
+    since Python 3.2. It's safe since the copy is only read, with the same
+    functions ``os.environ`` uses itself. Any other mapping, or an
+    ``os.environ`` without these attributes, is copied through the mapping
+    API instead.
+    """
+    data = getattr(environ, '_data', None)
+    functions = [getattr(environ, name, None) for name in
+                 ('encodekey', 'decodekey', 'decodevalue')]
+    if isinstance(data, dict) and all(map(callable, functions)):
+        return (data.copy(), *functions)
+    return (dict(environ), str, str, str)
+
+
+class Environment(Mapping):
+    """
+    An immutable snapshot of the environment variables to set up values
+    from, recording which of them were looked up.
+    """
+    def __init__(self, environ):
+        (self._data, self._encodekey, self._decodekey,
+         self._decodevalue) = copy_environ(environ)
+        self.used = set()
+        self.prefixes = set()
+        self._by_prefix = {}
+
+    def __getitem__(self, name):
+        return self._decodevalue(self._data[self._encodekey(name)])
+
+    def __iter__(self):
+        return map(self._decodekey, self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __eq__(self, other):
+        if (isinstance(other, Environment)
+                and self._decodevalue == other._decodevalue):
+            # compare the encoded variables without decoding them
+            return self._data == other._data
+        return super().__eq__(other)
+
+    def lookup(self, name, prefix=None):
+        """
+        Returns the value of the variable or None, recording the lookup.
+        """
+        self.used.add(name)
+        if prefix:
+            self.prefixes.add(prefix)
+        value = self._data.get(self._encodekey(name))
+        if value is not None:
+            return self._decodevalue(value)
+
+    def with_prefix(self, prefix):
+        """
+        Returns the names of the variables starting with the prefix and an
+        underscore, indexing them once per prefix.
+        """
+        try:
+            return self._by_prefix[prefix]
+        except KeyError:
+            start = f'{prefix}_'
+            names = self._by_prefix[prefix] = frozenset(
+                name for name in self if name.startswith(start))
+            return names
+
+    def unused(self, prefixes=None):
+        """
+        Returns the names of the variables with one of the prefixes, by
+        default the prefixes of the values looked up, that no value
+        looked up.
+        """
+        names = set()
+        for prefix in self.prefixes if prefixes is None else prefixes:
+            names.update(self.with_prefix(prefix))
+        return sorted(names - self.used)
+
+
+# the environment values are set up from while a configuration is set up
+_environment = ContextVar('environment', default=None)
+
+
+@contextmanager
+def resolving(environment):
+    """
+    Sets up values from the given environment instead of ``os.environ``
+    within the block.
+    """
+    token = _environment.set(environment)
+    try:
+        yield environment
+    finally:
+        _environment.reset(token)
+
+
+def lookup_environ(name, prefix=None):
+    environment = _environment.get()
+    if environment is None:
+        return os.environ.get(name)
+    return environment.lookup(name, prefix)
+
+
+@lru_cache(maxsize=None)
+def _full_environ_name(environ_name, environ_prefix, name):
+    if not environ_name:
+        environ_name = name.upper()
+    if environ_prefix:
+        environ_name = f'{environ_prefix}_{environ_name}'
+    return environ_name
+
+
+def resolve_values(pending):
+    """
+    Runs the resolvers of the values in the given ``(name, value)`` pairs
+    that need them concurrently in one event loop, keeping the results on
+    the values until they are set up.
+    """
+    pending = [(name, value) for name, value in pending
+               if value.needs_resolving(name)]
+    if not pending:
+        return
+
+    async def gather():
+        await asyncio.gather(*(value.resolve(name) for name, value in pending))
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        asyncio.run(gather())
+    else:
+        # the event loop running in this thread can't be waited for
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            executor.submit(asyncio.run, gather()).result()
+
+
+def publishing(setup):
+    """
+    Wraps the ``setup`` method of a value class, so that the value is only
+    published, i.e. read without waiting for the thread setting it up,
+    when the ``setup`` method of the value's own class returns, e.g. after
+    the checks of a subclass.
+    """
+    @wraps(setup)
+    def publishing_setup(self, name):
+        if '_staged' in self.__dict__:
+            # called with super() by the setup method of a subclass
+            return setup(self, name)
+        self.__dict__['_staged'] = _unset
+        try:
+            result = setup(self, name)
+            staged = self.__dict__['_staged']
+            if staged is not _unset:
+                self._value = staged
+        finally:
+            del self.__dict__['_staged']
+        return result
+    return publishing_setup
+
+
+def setup_value(target, name, value, actual_value=_unset):
+    if actual_value is _unset:
+        with setting_up(id(value)), measure('value', name, value):
+            actual_value = value.setup(name)
     # overwriting the original Value class with the result
     setattr(target, name, value.value)
     if value.multiple:
@@ -25,22 +277,62 @@ class Value:
     A single settings value that is able to interpret env variables
     and implements a simple validation scheme.
     """
+    # the attributes every value has, other attributes only take up space
+    # in the instance dictionary if they differ from the class attribute
+    __slots__ = ('default', 'environ', 'environ_prefix', '_value',
+                 '__dict__', '__weakref__')
+
     multiple = False
     late_binding = False
+    environ_name = None
     environ_required = False
+    per_worker = False
+    resolver = None
+    # whether the value can be set up in a background thread
+    prefetch = True
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if 'setup' in vars(cls):
+            cls.setup = publishing(vars(cls)['setup'])
 
     @property
     def value(self):
-        value = self.default
-        if not hasattr(self, '_value') and self.environ_name:
-            self.setup(self.environ_name)
-        if hasattr(self, '_value'):
-            value = self._value
-        return value
+        value = getattr(self, '_value', _unset)
+        if value is not _unset:
+            return value
+        if not self.environ_name:
+            return self.default
+        # set up values with a given environment variable name once, other
+        # threads wait for the result
+        with setting_up(id(self)):
+            if not hasattr(self, '_value'):
+                try:
+                    self.setup(self.environ_name)
+                except Exception:
+                    # run the resolver again the next time
+                    self.reset()
+                    raise
+            return self._value
 
     @value.setter
     def value(self, value):
-        self._value = value
+        if '_staged' in self.__dict__:
+            # set by the setup method, published when it returns
+            self.__dict__['_staged'] = value
+        else:
+            self._value = value
+
+    def reset(self):
+        """
+        Forgets the set up value and the result of the resolver, e.g. to
+        set it up again in tests after changing the environment.
+        """
+        try:
+            del self._value
+        except AttributeError:
+            pass
+        self.__dict__.pop('_resolved', None)
 
     def __new__(cls, *args, **kwargs):
         """
@@ -52,6 +344,9 @@ class Value:
             instance.late_binding = kwargs.get('late_binding')
         if not instance.late_binding:
             instance.__init__(*args, **kwargs)
+            if instance.per_worker:
+                # set up again in each worker of an application server
+                return instance
             if ((instance.environ and instance.environ_name)
                     or (not instance.environ and instance.default)):
                 instance = instance.setup(instance.environ_name)
@@ -59,7 +354,8 @@ class Value:
 
     def __init__(self, default=None, environ=True, environ_name=None,
                  environ_prefix='DJANGO', environ_required=False,
-                 *args, **kwargs):
+                 *args, per_worker=False, prefetch=None, resolver=None,
+                 **kwargs):
         if isinstance(default, Value) and default.default is not None:
             self.default = copy.copy(default.default)
         else:
@@ -68,8 +364,18 @@ class Value:
         if environ_prefix and environ_prefix.endswith('_'):
             environ_prefix = environ_prefix[:-1]
         self.environ_prefix = environ_prefix
-        self.environ_name = environ_name
-        self.environ_required = environ_required
+        if environ_name != self.environ_name:
+            self.environ_name = environ_name
+        if environ_required != self.environ_required:
+            self.environ_required = environ_required
+        if per_worker != self.per_worker:
+            self.per_worker = per_worker
+        if prefetch is not None and prefetch != self.prefetch:
+            self.prefetch = prefetch
+        if resolver is not None:
+            if isinstance(resolver, str):
+                check_importable(resolver)
+            self.resolver = resolver
 
     def __str__(self):
         return str(self.value)
@@ -87,25 +393,54 @@ class Value:
     __nonzero__ = __bool__
 
     def full_environ_name(self, name):
-        if self.environ_name:
-            environ_name = self.environ_name
-        else:
-            environ_name = name.upper()
-        if self.environ_prefix:
-            environ_name = f'{self.environ_prefix}_{environ_name}'
-        return environ_name
+        return _full_environ_name(self.environ_name, self.environ_prefix, name)
 
+    def needs_resolving(self, name):
+        """
+        Whether the resolver of the value has to run to set it up, i.e. it
+        didn't run yet and the environment variable isn't set.
+        """
+        if self.resolver is None or '_resolved' in self.__dict__:
+            return False
+        return not self.environ or lookup_environ(
+            self.full_environ_name(name), self.environ_prefix) is None
+
+    async def resolve(self, name):
+        """
+        Runs the resolver, which may be a coroutine function, with the name
+        of the setting and keeps its result.
+        """
+        resolver = self.resolver
+        if isinstance(resolver, str):
+            resolver = import_cached(resolver)
+        with measure('resolver', name, self):
+            result = resolver(name)
+            if inspect.isawaitable(result):
+                result = await result
+        self.__dict__['_resolved'] = result
+        return result
+
+    @publishing
     def setup(self, name):
-        value = self.default
+        environ_value = None
         if self.environ:
             full_environ_name = self.full_environ_name(name)
-            if full_environ_name in os.environ:
-                value = self.to_python(os.environ[full_environ_name])
-            elif self.environ_required:
-                raise ValueError('Value {!r} is required to be set as the '
-                                 'environment variable {!r}'
-                                 .format(name, full_environ_name))
-        self.value = value
+            environ_value = lookup_environ(full_environ_name,
+                                           self.environ_prefix)
+        if environ_value is None and self.resolver is not None:
+            # resolvers return values like those of environment variables
+            resolve_values([(name, self)])
+            environ_value = self.__dict__.get('_resolved')
+        if environ_value is not None:
+            with measure('to_python', name, self):
+                value = self.to_python(environ_value)
+        elif self.environ and self.environ_required:
+            raise ValueError('Value {!r} is required to be set as the '
+                             'environment variable {!r}'
+                             .format(name, full_environ_name))
+        else:
+            value = self.default
+        self.__dict__['_staged'] = value
         return value
 
     def to_python(self, value):
@@ -145,33 +480,40 @@ class BooleanValue(Value):
 class CastingMixin:
     exception = (TypeError, ValueError)
     message = 'Cannot interpret value {0!r}'
+    _params = None
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         if isinstance(self.caster, str):
-            try:
-                self._caster = import_string(self.caster)
-            except ImportError as err:
-                msg = f"Could not import {self.caster!r}"
-                raise ImproperlyConfigured(msg) from err
-        elif callable(self.caster):
-            self._caster = self.caster
-        else:
+            # imported when first used, so that values which are never
+            # converted don't import e.g. dj_database_url
+            check_importable(self.caster)
+        elif not callable(self.caster):
             error = 'Cannot use caster of {} ({!r})'.format(self,
                                                               self.caster)
             raise ValueError(error)
-        try:
-            arg_names = getargspec(self._caster)[0]
-            self._params = {name: kwargs[name] for name in arg_names if name in kwargs}
-        except TypeError:
-            self._params = {}
+        params = {name: value for name, value in kwargs.items()
+                  if name not in value_arguments}
+        if params:
+            # the arguments that the caster accepts are picked on use
+            self._params = params
+
+    @property
+    def _caster(self):
+        if isinstance(self.caster, str):
+            return import_cached(self.caster)
+        return self.caster
 
     def to_python(self, value):
+        caster = self._caster
         try:
             if self._params:
-                return self._caster(value, **self._params)
+                arg_names = argument_names(caster)
+                params = {name: param for name, param in self._params.items()
+                          if name in arg_names}
+                return caster(value, **params)
             else:
-                return self._caster(value)
+                return caster(value)
         except self.exception:
             raise ValueError(self.message.format(value))
 
@@ -207,11 +549,14 @@ class SequenceValue(Value):
     # Specify this value in subclasses, e.g. with 'list' or 'tuple'
     sequence_type = None
     converter = None
+    separator = ','
 
     def __init__(self, *args, **kwargs):
         msg = 'Cannot interpret {0} item {{0!r}} in {0} {{1!r}}'
-        self.message = msg.format(self.sequence_type.__name__)
-        self.separator = kwargs.pop('separator', ',')
+        self.message = sys.intern(msg.format(self.sequence_type.__name__))
+        separator = kwargs.pop('separator', self.separator)
+        if separator != self.separator:
+            self.separator = separator
         converter = kwargs.pop('converter', None)
         if converter is not None:
             self.converter = converter
@@ -257,8 +602,12 @@ class SingleNestedSequenceValue(SequenceValue):
     Do not use this class directly. Instead use a subclass.
     """
 
+    seq_separator = ';'
+
     def __init__(self, *args, **kwargs):
-        self.seq_separator = kwargs.pop('seq_separator', ';')
+        seq_separator = kwargs.pop('seq_separator', self.seq_separator)
+        if seq_separator != self.seq_separator:
+            self.seq_separator = seq_separator
         super().__init__(*args, **kwargs)
 
     def _convert(self, items):
@@ -290,13 +639,37 @@ class SingleNestedTupleValue(SingleNestedSequenceValue):
     sequence_type = tuple
 
 
+# dotted paths that BackendsValue imported successfully
+validated_backends = set()
+
+
 class BackendsValue(ListValue):
+    deferred = False
+    # importing a backend in a background thread can wait for the settings
+    # module to be imported, which waits for the background thread
+    prefetch = False
+
+    def __init__(self, *args, **kwargs):
+        deferred = kwargs.pop('deferred', self.deferred)
+        if deferred != self.deferred:
+            self.deferred = deferred
+        if deferred:
+            from .checks import register_backends_check
+            register_backends_check()
+        super().__init__(*args, **kwargs)
 
     def converter(self, value):
+        if value in validated_backends:
+            return value
+        if self.deferred:
+            from .checks import deferred_backends
+            deferred_backends.add(value)
+            return value
         try:
             import_string(value)
         except ImportError as err:
             raise ValueError(err).with_traceback(sys.exc_info()[2])
+        validated_backends.add(value)
         return value
 
 
@@ -342,19 +715,19 @@ class ValidationMixin:
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         if isinstance(self.validator, str):
-            try:
-                self._validator = import_string(self.validator)
-            except ImportError as err:
-                msg = f"Could not import {self.validator!r}"
-                raise ImproperlyConfigured(msg) from err
-        elif callable(self.validator):
-            self._validator = self.validator
-        else:
+            check_importable(self.validator)
+        elif not callable(self.validator):
             raise ValueError('Cannot use validator of '
                              '{} ({!r})'.format(self, self.validator))
         if self.default:
             self.to_python(self.default)
 
+    @property
+    def _validator(self):
+        if isinstance(self.validator, str):
+            return import_cached(self.validator)
+        return self.validator
+
     def to_python(self, value):
         try:
             self._validator(value)
@@ -418,7 +791,30 @@ class SecretValue(Value):
         return value
 
 
-class EmailURLValue(CastingMixin, MultipleMixin, Value):
+# the slot of Value.default, which URLDefaultMixin stores the default in
+_default_slot = Value.__dict__['default']
+
+
+class URLDefaultMixin:
+    """
+    Converts a default given as a URL when it's first used rather than when
+    the value is declared, so that e.g. ``DatabaseURLValue('sqlite://')``
+    only imports its caster if no environment variable is set.
+    """
+    @property
+    def default(self):
+        default = _default_slot.__get__(self)
+        if isinstance(default, str):
+            default = self.to_python(default)
+            _default_slot.__set__(self, default)
+        return default
+
+    @default.setter
+    def default(self, default):
+        _default_slot.__set__(self, {} if default is None else default)
+
+
+class EmailURLValue(URLDefaultMixin, CastingMixin, MultipleMixin, Value):
     caster = 'dj_email_url.parse'
     message = 'Cannot interpret email URL value {0!r}'
     late_binding = True
@@ -428,13 +824,9 @@ class EmailURLValue(CastingMixin, MultipleMixin, Value):
         kwargs.setdefault('environ_prefix', None)
         kwargs.setdefault('environ_name', 'EMAIL_URL')
         super().__init__(*args, **kwargs)
-        if self.default is None:
-            self.default = {}
-        else:
-            self.default = self.to_python(self.default)
 
 
-class DictBackendMixin(Value):
+class DictBackendMixin(URLDefaultMixin, Value):
     default_alias = 'default'
 
     def __init__(self, *args, **kwargs):
@@ -443,10 +835,6 @@ class DictBackendMixin(Value):
         kwargs.setdefault('environ_prefix', None)
         kwargs.setdefault('environ_name', self.environ_name)
         super().__init__(*args, **kwargs)
-        if self.default is None:
-            self.default = {}
-        else:
-            self.default = self.to_python(self.default)
 
     def to_python(self, value):
         value = super().to_python(value)
@@ -1,6 +1,6 @@
 from . import importer
 
-importer.install()
+importer.install(settle=True)
 
 from django.core.wsgi import get_wsgi_application    # noqa: E402
 
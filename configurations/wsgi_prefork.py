@@ -0,0 +1,22 @@
+"""
+A WSGI application for pre-forking application servers that load it once
+in the master process, e.g. ``gunicorn --preload`` or uWSGI without
+``lazy-apps``::
+
+    gunicorn --preload --workers=8 configurations.wsgi_prefork:application
+
+Besides setting up the configuration and Django, it warms up the URLconf,
+template loaders and translations and freezes the objects for the garbage
+collector, see :mod:`configurations.prefork`.
+"""
+from . import importer
+
+importer.install(settle=True)
+
+from django.core.wsgi import get_wsgi_application    # noqa: E402
+
+from .prefork import freeze, warm_up  # noqa: E402
+
+application = get_wsgi_application()
+warm_up()
+freeze()
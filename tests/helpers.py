@@ -0,0 +1,18 @@
+import importlib
+import importlib.util
+
+from configurations.importer import ConfigurationFinder
+
+
+def load_settings(name):
+    """
+    Sets up a new module object of the settings module with the given name
+    and the configuration class of the environment, like the importer, but
+    without adding it to ``sys.modules``.
+    """
+    finder = ConfigurationFinder()
+    path = importlib.import_module(name.rpartition('.')[0]).__path__
+    spec = finder.find_spec(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
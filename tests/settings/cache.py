@@ -0,0 +1,17 @@
+from configurations import Configuration, pristinemethod, values
+
+
+class CachedConfiguration(Configuration):
+
+    CACHED_VALUE = values.Value('default')
+
+    @property
+    def CACHED_PROPERTY(self):
+        return [self.CACHED_VALUE, 'property']
+
+
+class UncachableConfiguration(CachedConfiguration):
+
+    @pristinemethod
+    def CALLABLE_SETTING():
+        return 'callable'
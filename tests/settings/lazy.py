@@ -0,0 +1,23 @@
+from configurations import Configuration, values
+
+
+class LazyConfiguration(Configuration):
+    LAZY_SETTINGS = True
+
+    PLAIN_SETTING = 'plain'
+
+    LAZY_VALUE = values.Value('lazy')
+
+    BROKEN_VALUE = values.IntegerValue(1)
+
+    EMAIL = values.EmailURLValue('console://')
+
+    @property
+    def COMPUTED_SETTING(self):
+        return [self.LAZY_VALUE.upper(), self.PLAIN_SETTING]
+
+    def METHOD_VALUE(self):
+        return values.Value('method', environ_name='METHOD_VALUE')
+
+    def BROKEN_METHOD(self):
+        return self.MISSING
@@ -0,0 +1,30 @@
+import threading
+import time
+
+from configurations import Configuration, values
+
+threads = set()
+# passed once the three values are set up at the same time
+barrier = threading.Barrier(3)
+
+
+class SlowValue(values.Value):
+
+    def to_python(self, value):
+        threads.add(threading.current_thread().name)
+        barrier.wait(timeout=5)
+        time.sleep(0.1)
+        return value
+
+
+class Prefetch(Configuration):
+    PREFETCH_VALUES = True
+
+    FIRST = SlowValue('first', environ_required=True)
+    SECOND = SlowValue('second', environ_required=True)
+    THIRD = SlowValue('third', environ_required=True)
+    HANDLERS = values.BackendsValue(['logging.StreamHandler'])
+
+    @property
+    def ALL(self):
+        return [self.FIRST, self.SECOND, self.THIRD]
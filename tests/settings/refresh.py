@@ -0,0 +1,30 @@
+import os
+
+from configurations import Configuration, values
+
+computed = []
+
+
+class Refresh(Configuration):
+    DOTENV = os.environ.get('REFRESH_DOTENV')
+
+    NAME = values.Value('name')
+    PORT = values.IntegerValue(8000)
+    WORKER_ID = values.IntegerValue(0, per_worker=True)
+
+    @property
+    def ADDRESS(self):
+        return f'{self.NAME}:{self.PORT}'
+
+    @property
+    def URL(self):
+        return f'http://{self.ADDRESS}/'
+
+    @property
+    def UNRELATED(self):
+        computed.append('UNRELATED')
+        return 'unrelated'
+
+    @property
+    def CACHE_PREFIX(self):
+        return f'{self.NAME}-{self.WORKER_ID}'
@@ -0,0 +1,32 @@
+from configurations import Configuration
+
+
+class Mixin1:
+    @property
+    def ALLOWED_HOSTS(self):
+        allowed_hosts = super().ALLOWED_HOSTS[:]
+        allowed_hosts.append('test1')
+        return allowed_hosts
+
+
+class Base(Configuration):
+    SHARED_DEFAULTS = True
+
+    TIME_ZONE = 'Europe/Berlin'
+
+
+class Inheritance(Mixin1, Base):
+
+    def ALLOWED_HOSTS(self):
+        allowed_hosts = super().ALLOWED_HOSTS[:]
+        allowed_hosts.append('test2')
+        return allowed_hosts
+
+
+class Copied(Mixin1, Configuration):
+    TIME_ZONE = 'Europe/Berlin'
+
+    def ALLOWED_HOSTS(self):
+        allowed_hosts = super().ALLOWED_HOSTS[:]
+        allowed_hosts.append('test2')
+        return allowed_hosts
@@ -0,0 +1,7 @@
+from django.utils.translation import gettext_lazy
+
+from configurations import Configuration
+
+
+class Translated(Configuration):
+    LANGUAGES = [('en', gettext_lazy('English'))]
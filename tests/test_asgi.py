@@ -0,0 +1,60 @@
+import asyncio
+import threading
+
+from django.test import SimpleTestCase
+
+from configurations.asgi_async import Application
+
+
+class ASGITests(SimpleTestCase):
+
+    def run_application(self, application, scope, messages):
+        sent = []
+
+        async def receive():
+            if messages:
+                return messages.pop(0)
+            # Django listens for the disconnect until the response is sent
+            await asyncio.Event().wait()
+
+        async def send(message):
+            sent.append(message)
+
+        asyncio.run(application(scope, receive, send))
+        return sent
+
+    def test_lifespan(self):
+        threads = []
+
+        def build():
+            threads.append(threading.current_thread())
+            return 'application'
+
+        application = Application(build)
+        sent = self.run_application(application, {'type': 'lifespan'}, [
+            {'type': 'lifespan.startup'}, {'type': 'lifespan.shutdown'}])
+        self.assertEqual(sent, [{'type': 'lifespan.startup.complete'},
+                                {'type': 'lifespan.shutdown.complete'}])
+        self.assertEqual(application.application, 'application')
+        # built outside of the thread running the event loop
+        self.assertNotEqual(threads, [threading.current_thread()])
+
+    def test_lifespan_failed(self):
+        def build():
+            raise ValueError('broken')
+
+        application = Application(build)
+        with self.assertLogs('configurations.asgi_async', 'ERROR'):
+            sent = self.run_application(application, {'type': 'lifespan'}, [
+                {'type': 'lifespan.startup'}])
+        self.assertEqual(sent, [{'type': 'lifespan.startup.failed',
+                                 'message': 'broken'}])
+
+    def test_http(self):
+        application = Application()
+        sent = self.run_application(application, {
+            'type': 'http', 'method': 'GET', 'path': '/missing/',
+            'headers': [(b'host', b'testserver')], 'query_string': b'',
+        }, [{'type': 'http.request', 'body': b'', 'more_body': False}])
+        self.assertEqual(sent[0]['type'], 'http.response.start')
+        self.assertEqual(sent[0]['status'], 404)
@@ -0,0 +1,58 @@
+import os
+import tempfile
+from pathlib import Path
+
+from django.test import TestCase
+from django.utils.autoreload import (autoreload_started, file_changed,
+                                     BaseReloader)
+
+from unittest.mock import patch
+
+from configurations import autoreload
+
+from .helpers import load_settings
+
+
+class AutoreloadTests(TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.dotenv = os.path.join(directory.name, '.env')
+        self.write_dotenv('DJANGO_PORT=8001\n')
+        self.addCleanup(autoreload._watched.clear)
+        self.addCleanup(autoreload_started.disconnect,
+                        dispatch_uid=autoreload.__name__)
+        self.addCleanup(file_changed.disconnect,
+                        dispatch_uid=autoreload.__name__)
+
+    def write_dotenv(self, content):
+        with open(self.dotenv, 'w') as fp:
+            fp.write(content)
+
+    @patch.dict(os.environ, clear=True,
+                DJANGO_SETTINGS_MODULE='tests.settings.refresh',
+                DJANGO_CONFIGURATION='Refresh', RUN_MAIN='true')
+    def test_dotenv_changed(self):
+        os.environ['REFRESH_DOTENV'] = self.dotenv
+        module = load_settings('tests.settings.refresh')
+
+        reloader = BaseReloader()
+        autoreload_started.send(sender=reloader)
+        self.assertIn(Path(self.dotenv), reloader.extra_files)
+
+        self.write_dotenv('DJANGO_PORT=10001\n')
+        results = file_changed.send(sender=reloader,
+                                    file_path=Path(self.dotenv))
+        self.assertTrue(any(result for _, result in results))
+        self.assertEqual(module.URL, 'http://name:10001/')
+
+        results = file_changed.send(sender=reloader,
+                                    file_path=Path(__file__))
+        self.assertFalse(any(result for _, result in results))
+
+        with patch.object(autoreload, 'RESTART_SETTINGS', {'PORT'}):
+            self.write_dotenv('DJANGO_PORT=100001\n')
+            results = file_changed.send(sender=reloader,
+                                        file_path=Path(self.dotenv))
+        self.assertFalse(any(result for _, result in results))
@@ -0,0 +1,81 @@
+import importlib
+import os
+import sys
+import tempfile
+
+from django.test import TestCase
+
+from unittest.mock import patch
+
+from .helpers import load_settings
+
+
+class SnapshotCacheTests(TestCase):
+
+    def setUp(self):
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.cache_dir.cleanup)
+
+    def load(self):
+        sys.modules.pop('tests.settings.cache', None)
+        return importlib.import_module('tests.settings.cache')
+
+    def env(self, **kwargs):
+        return patch.dict(os.environ, clear=True,
+                          DJANGO_SETTINGS_MODULE='tests.settings.cache',
+                          DJANGO_CONFIGURATION_CACHE=self.cache_dir.name,
+                          **kwargs)
+
+    def test_snapshot_restored(self):
+        with self.env(DJANGO_CONFIGURATION='CachedConfiguration'):
+            module = self.load()
+            self.assertTrue(hasattr(module, 'CachedConfiguration'))
+            self.assertEqual(os.listdir(self.cache_dir.name),
+                             ['tests.settings.cache.CachedConfiguration.pickle'])
+
+            module = self.load()
+            self.assertFalse(hasattr(module, 'CachedConfiguration'))
+            self.assertEqual(module.CACHED_VALUE, 'default')
+            self.assertEqual(module.CACHED_PROPERTY, ['default', 'property'])
+            self.assertEqual(module.CONFIGURATION,
+                             'tests.settings.cache.CachedConfiguration')
+
+    def test_snapshot_invalidated_by_environment(self):
+        with self.env(DJANGO_CONFIGURATION='CachedConfiguration'):
+            self.load()
+        with self.env(DJANGO_CONFIGURATION='CachedConfiguration',
+                      DJANGO_CACHED_VALUE='override'):
+            module = self.load()
+            self.assertTrue(hasattr(module, 'CachedConfiguration'))
+            self.assertEqual(module.CACHED_VALUE, 'override')
+
+    def test_snapshot_invalidated_by_sources(self):
+        with self.env(DJANGO_CONFIGURATION='CachedConfiguration'):
+            self.load()
+            with patch('configurations.cache.file_signature',
+                       return_value=(0, 0)):
+                module = self.load()
+            self.assertTrue(hasattr(module, 'CachedConfiguration'))
+
+    def test_settings_module_callables_not_cached(self):
+        with self.env(DJANGO_CONFIGURATION='UncachableConfiguration'):
+            module = self.load()
+            self.assertEqual(module.CALLABLE_SETTING(), 'callable')
+            self.assertEqual(os.listdir(self.cache_dir.name), [])
+
+    def test_lazy_settings_not_cached(self):
+        with patch.dict(os.environ, clear=True,
+                        DJANGO_SETTINGS_MODULE='tests.settings.lazy',
+                        DJANGO_CONFIGURATION='LazyConfiguration',
+                        DJANGO_CONFIGURATION_CACHE=self.cache_dir.name,
+                        DJANGO_BROKEN_VALUE='not a number'):
+            module = load_settings('tests.settings.lazy')
+            self.assertNotIn('LAZY_VALUE', vars(module))
+            self.assertNotIn('BROKEN_VALUE', vars(module))
+            self.assertEqual(os.listdir(self.cache_dir.name), [])
+
+    def test_disabled_by_default(self):
+        with self.env(DJANGO_CONFIGURATION='CachedConfiguration'):
+            del os.environ['DJANGO_CONFIGURATION_CACHE']
+            self.load()
+            self.assertEqual(os.listdir(self.cache_dir.name), [])
@@ -1,7 +1,16 @@
+import importlib
 import os
+import sys
+import tempfile
+
+from django.core.exceptions import ImproperlyConfigured
 from django.test import TestCase
 from unittest.mock import patch
 
+from configurations.dotenv import parse, read, read_files
+from configurations.values import (Environment, Value, copy_environ,
+                                   resolving)
+
 
 class DotEnvLoadingTests(TestCase):
 
@@ -13,3 +22,202 @@ class DotEnvLoadingTests(TestCase):
         self.assertEqual(dot_env.DOTENV_VALUE, 'is set')
         self.assertEqual(dot_env.DOTENV_VALUE_METHOD, 'is set')
         self.assertEqual(dot_env.DOTENV_LOADED, dot_env.DOTENV)
+
+
+class EnvironmentTests(TestCase):
+
+    def test_snapshot(self):
+        environ = {'DJANGO_USED': 'used', 'DJANGO_UNUSED': 'unused',
+                   'APP_UNUSED': 'unused', 'OTHER': 'other'}
+        environment = Environment(environ)
+        environ['DJANGO_USED'] = 'changed'
+        value = Value('default', late_binding=True)
+        with resolving(environment):
+            self.assertEqual(value.setup('USED'), 'used')
+            self.assertEqual(value.setup('MISSING'), 'default')
+        self.assertEqual(environment.with_prefix('DJANGO'),
+                         {'DJANGO_USED', 'DJANGO_UNUSED'})
+        self.assertEqual(environment.unused(), ['DJANGO_UNUSED'])
+        self.assertEqual(environment.unused(['APP', 'OTHER']), ['APP_UNUSED'])
+        with patch.dict(os.environ, clear=True, DJANGO_USED='environ'):
+            self.assertEqual(value.setup('USED'), 'environ')
+            environment = Environment(os.environ)
+            os.environ['DJANGO_USED'] = 'changed'
+            self.assertEqual(dict(environment), {'DJANGO_USED': 'environ'})
+            self.assertEqual(environment.lookup('DJANGO_USED'), 'environ')
+            self.assertIsNone(environment.lookup('DJANGO_MISSING'))
+
+    @patch.dict(os.environ, clear=True, DJANGO_USED='environ')
+    def test_copy_environ(self):
+        data, encodekey, decodekey, decodevalue = copy_environ(os.environ)
+        self.assertEqual(
+            {decodekey(name): decodevalue(value)
+             for name, value in data.items()}, {'DJANGO_USED': 'environ'})
+        self.assertIn(encodekey('DJANGO_USED'), data)
+
+        class Environ(dict):
+            # like os.environ without the functions to decode its data
+            _data = {b'DJANGO_USED': b'raw'}
+
+        self.assertEqual(copy_environ(Environ(DJANGO_USED='environ')),
+                         ({'DJANGO_USED': 'environ'}, str, str, str))
+        self.assertEqual(Environment(os.environ),
+                         Environment({'DJANGO_USED': 'environ'}))
+
+    @patch.dict(os.environ, clear=True,
+                DJANGO_CONFIGURATION='CachedConfiguration',
+                DJANGO_SETTINGS_MODULE='tests.settings.cache',
+                DJANGO_CACHED_VALUE='environ',
+                DJANGO_CACHED_VALEU='typo',
+                DJANGO_COLORS='nocolor')
+    def test_unused_environ(self):
+        with patch.dict('sys.modules'):
+            sys.modules.pop('tests.settings.cache', None)
+            cache = importlib.import_module('tests.settings.cache')
+            self.assertEqual(cache.CACHED_VALUE, 'environ')
+            self.assertEqual(cache.CachedConfiguration.unused_environ(),
+                             ['DJANGO_CACHED_VALEU'])
+
+
+class DotEnvFilesTests(TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.paths = []
+        for name, content in (('.env', 'BASE=base\nSHARED=base\n'),
+                              ('.env.local', 'SHARED=local\nLOCAL=local\n')):
+            path = os.path.join(directory.name, name)
+            with open(path, 'w') as fp:
+                fp.write(content)
+            self.paths.append(path)
+
+    @patch.dict(os.environ, clear=True, LOCAL='environ')
+    def test_env_files_loaded(self):
+        from configurations import Configuration
+
+        class DotEnvFiles(Configuration):
+            DOTENV = self.paths
+
+        DotEnvFiles.pre_setup()
+        self.assertEqual(DotEnvFiles.DOTENV_LOADED, self.paths)
+        self.assertEqual(os.environ['BASE'], 'base')
+        self.assertEqual(os.environ['SHARED'], 'local')
+        self.assertEqual(os.environ['LOCAL'], 'environ')
+
+    def test_missing_env_file(self):
+        from configurations import Configuration
+
+        class MissingDotEnvFile(Configuration):
+            DOTENV = self.paths + ['/non/existing/.env']
+
+        with self.assertRaises(ImproperlyConfigured) as cm:
+            MissingDotEnvFile.load_dotenv()
+        self.assertIn('/non/existing/.env', str(cm.exception))
+
+    def test_read_files_cached(self):
+        self.assertEqual(read_files(self.paths),
+                         {'BASE': 'base', 'SHARED': 'local', 'LOCAL': 'local'})
+        with patch('configurations.dotenv.parse') as parse_mock:
+            self.assertIs(read_files(self.paths), read_files(self.paths))
+            self.assertEqual(read_files(self.paths[1:]),
+                             {'SHARED': 'local', 'LOCAL': 'local'})
+        self.assertFalse(parse_mock.called)
+
+        with open(self.paths[0], 'a') as fp:
+            fp.write('ADDED=1\n')
+        self.assertEqual(read_files(self.paths)['ADDED'], '1')
+
+
+class DotEnvParserTests(TestCase):
+
+    def test_assignments(self):
+        self.assertEqual(parse(
+            'KEY=value\n'
+            'export EXPORTED=1\n'
+            '# COMMENTED=1\n'
+            '\n'
+            'not an assignment\n'
+            'SPACED = ignored\n'
+            'EMPTY=\n'
+            'RAW=value # with hash\n'
+            'KEY=first definition wins\n'
+        ), {
+            'KEY': 'value',
+            'EXPORTED': '1',
+            'EMPTY': '',
+            'RAW': 'value # with hash',
+        })
+
+    def test_quoted_values(self):
+        self.assertEqual(parse(
+            'SINGLE=\'single \\"quoted\\"\'\n'
+            'DOUBLE="double \\"quoted\\""\n'
+            'APOSTROPHE=\'it\'s\'\n'
+            'COMMENT="value" # comment\n'
+            'UNTERMINATED="value\n'
+        ), {
+            'SINGLE': 'single \\"quoted\\"',
+            'DOUBLE': 'double "quoted"',
+            'APOSTROPHE': "it's",
+            'COMMENT': 'value',
+            'UNTERMINATED': '"value',
+        })
+
+    def test_multiline_values(self):
+        self.assertEqual(parse(
+            'KEY="-----BEGIN KEY-----\n'
+            'line \\"two\\"\n'
+            '-----END KEY-----"  # comment\n'
+            "SINGLE='first\n"
+            "second'\n"
+            'AFTER=value\n'
+        ), {
+            'KEY': '-----BEGIN KEY-----\nline "two"\n-----END KEY-----',
+            'SINGLE': 'first\nsecond',
+            'AFTER': 'value',
+        })
+
+    def test_text_after_closing_quote(self):
+        # taken as is, like before multiline values were supported
+        self.assertEqual(parse(
+            'A="foo" bar\n'
+            'B="x"\n'
+            'C=1\n'
+        ), {
+            'A': '"foo" bar',
+            'B': 'x',
+            'C': '1',
+        })
+
+    def test_missing_closing_quote(self):
+        self.assertEqual(parse(
+            'SECRET_KEY="abc\n'
+            'DEBUG=1\n'
+            'NAME="name"\n'
+            "OTHER='abc\n"
+            "QUOTED='x' and more\n"
+        ), {
+            'SECRET_KEY': '"abc',
+            'DEBUG': '1',
+            'NAME': 'name',
+            'OTHER': "'abc",
+            'QUOTED': "'x' and more",
+        })
+
+    def test_parse_cache(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, '.env')
+            cache = os.path.join(directory, 'cache')
+            with open(path, 'w') as fp:
+                fp.write('KEY=value\n')
+            with patch.dict(os.environ, DJANGO_CONFIGURATION_CACHE=cache):
+                self.assertEqual(read(path), {'KEY': 'value'})
+                self.assertEqual(len(os.listdir(cache)), 1)
+                with patch('configurations.dotenv.parse') as parse_mock:
+                    self.assertEqual(read(path), {'KEY': 'value'})
+                self.assertFalse(parse_mock.called)
+
+                with open(path, 'w') as fp:
+                    fp.write('KEY=changed value\n')
+                self.assertEqual(read(path), {'KEY': 'changed value'})
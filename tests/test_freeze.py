@@ -0,0 +1,137 @@
+import decimal
+import os
+import pathlib
+import re
+import subprocess
+import sys
+import tempfile
+import types
+
+from django.test import TestCase
+from django.utils.functional import Promise, lazy
+from django.utils.translation import gettext_lazy, pgettext_lazy
+
+from configurations.freeze import SettingsRenderer, Unfreezable, freeze
+
+
+class Unimportable:
+    """
+    Raises on any other attribute, like a lazy object that isn't ready.
+    """
+    def __getattr__(self, name):
+        raise RuntimeError('not ready')
+
+
+def shout(text):
+    return text.upper()
+
+
+class FreezeTests(TestCase):
+
+    def frozen(self, **settings):
+        module = types.ModuleType('tests.settings.frozen')
+        module.__dict__.update(settings)
+        namespace = {}
+        exec(freeze(module), namespace)
+        return {name: value for name, value in namespace.items()
+                if name.isupper()}
+
+    def test_literals(self):
+        settings = {
+            'NONE': None,
+            'BOOL': False,
+            'INT': 1,
+            'FLOAT': 1.5,
+            'INFINITY': float('inf'),
+            'STRING': 'value',
+            'BYTES': b'value',
+            'LIST': [1, [2]],
+            'TUPLE': ('single',),
+            'EMPTY_SET': set(),
+            'SET': {'a', 'b'},
+            'FROZENSET': frozenset({1}),
+            'DICT': {'default': {'NAME': ':memory:'}},
+        }
+        self.assertEqual(self.frozen(**settings), settings)
+
+    def test_types_with_imports(self):
+        settings = {
+            'DECIMAL': decimal.Decimal('1.10'),
+            'PATH': pathlib.PurePosixPath('/srv/app'),
+            'PATTERN': re.compile(r'^/favicon\.ico$', re.IGNORECASE),
+            'CALLABLE': os.path.join,
+            'CLASS': decimal.Decimal,
+        }
+        self.assertEqual(self.frozen(**settings), settings)
+
+    def test_exclude_and_private_names(self):
+        module = types.ModuleType('tests.settings.frozen')
+        module.SECRET_KEY = 'secret'
+        module.DEBUG = False
+        module._PRIVATE = True
+        source = freeze(module, exclude=['SECRET_KEY'])
+        self.assertIn('DEBUG = False', source)
+        self.assertNotIn('SECRET_KEY', source)
+        self.assertNotIn('_PRIVATE', source)
+
+    def test_unfreezable(self):
+        with self.assertRaises(Unfreezable) as cm:
+            self.frozen(LAMBDA=lambda: None)
+        self.assertIn("Setting 'LAMBDA' can't be frozen", str(cm.exception))
+        with self.assertRaises(Unfreezable):
+            self.frozen(OBJECT=object())
+
+    def test_lazy_objects(self):
+        renderer = SettingsRenderer('tests.settings.frozen')
+        self.assertEqual(renderer.render(gettext_lazy('English')),
+                         "django.utils.translation.gettext_lazy('English')")
+        self.assertEqual(
+            renderer.render(pgettext_lazy('language', 'English')),
+            "django.utils.translation.pgettext_lazy('language', 'English')")
+        self.assertEqual(
+            renderer.render(lazy(shout, str)('quiet')),
+            f'django.utils.functional.lazy({__name__}.shout, builtins.str)'
+            "('quiet')")
+
+        settings = self.frozen(LANGUAGES=[('en', gettext_lazy('English'))])
+        name = settings['LANGUAGES'][0][1]
+        self.assertIsInstance(name, Promise)
+        self.assertEqual(name, 'English')
+
+    def test_unimportable_reference(self):
+        with self.assertRaises(Unfreezable) as cm:
+            self.frozen(OBJECT=Unimportable())
+        self.assertIn('not ready', str(cm.exception))
+
+    def test_freeze_command(self):
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, 'frozen.py')
+            subprocess.check_call(
+                [sys.executable, '-m', 'configurations', 'freeze',
+                 '--settings=tests.settings.cache',
+                 '--configuration=CachedConfiguration', '-o', output])
+            namespace = {}
+            with open(output) as fp:
+                exec(fp.read(), namespace)
+        self.assertEqual(namespace['CACHED_PROPERTY'], ['default', 'property'])
+        self.assertEqual(namespace['CONFIGURATION'],
+                         'tests.settings.cache.CachedConfiguration')
+
+    def test_freeze_command_error(self):
+        proc = subprocess.Popen(
+            [sys.executable, '-m', 'configurations', 'freeze',
+             '--settings=tests.settings.cache',
+             '--configuration=UncachableConfiguration'],
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        stderr = proc.communicate()[1].decode('utf-8')
+        self.assertEqual(proc.returncode, 1)
+        self.assertIn("Setting 'CALLABLE_SETTING' can't be frozen", stderr)
+
+    def test_freeze_command_lazy_translation(self):
+        output = subprocess.check_output(
+            [sys.executable, '-m', 'configurations', 'freeze',
+             '--settings=tests.settings.translated',
+             '--configuration=Translated']).decode('utf-8')
+        self.assertIn('import django.utils.translation\n', output)
+        self.assertIn("LANGUAGES = [('en', django.utils.translation."
+                      "gettext_lazy('English'))]", output)
@@ -36,3 +36,27 @@ class InheritanceTests(TestCase):
             mixin_inheritance.ALLOWED_HOSTS,
             ['test1', 'test2', 'test3']
         )
+
+    @patch.dict(os.environ, clear=True,
+                DJANGO_CONFIGURATION='Inheritance',
+                DJANGO_SETTINGS_MODULE='tests.settings.shared_defaults')
+    def test_shared_defaults(self):
+        from configurations.utils import uppercase_attributes
+        from tests.settings import shared_defaults
+
+        self.assertEqual(shared_defaults.ALLOWED_HOSTS, ['test1', 'test2'])
+        self.assertEqual(shared_defaults.TIME_ZONE, 'Europe/Berlin')
+        self.assertEqual(shared_defaults.LOGGING_CONFIG,
+                         'logging.config.dictConfig')
+
+        Inheritance = shared_defaults.Inheritance
+        self.assertNotIn('LOGGING_CONFIG', vars(Inheritance))
+        self.assertNotIn('LOGGING_CONFIG', vars(shared_defaults.Base))
+        self.assertIn('LOGGING_CONFIG', vars(shared_defaults.Copied))
+        self.assertEqual(
+            {name for name in dir(Inheritance) if name != 'SHARED_DEFAULTS'},
+            set(dir(shared_defaults.Copied)))
+        shared = uppercase_attributes(Inheritance)
+        copied = uppercase_attributes(shared_defaults.Copied)
+        del shared['SHARED_DEFAULTS']
+        self.assertEqual(shared.keys(), copied.keys())
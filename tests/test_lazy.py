@@ -0,0 +1,63 @@
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+from django.test import TestCase
+
+from unittest.mock import patch
+
+
+class LazySettingsTests(TestCase):
+
+    @patch.dict(os.environ, clear=True,
+                DJANGO_CONFIGURATION='LazyConfiguration',
+                DJANGO_SETTINGS_MODULE='tests.settings.lazy',
+                DJANGO_BROKEN_VALUE='not a number',
+                DJANGO_METHOD_VALUE='from environ')
+    def test_lazy_settings(self):
+        from tests.settings import lazy
+
+        resolved = vars(lazy)
+        self.assertEqual(resolved['PLAIN_SETTING'], 'plain')
+        self.assertEqual(resolved['EMAIL_HOST'], None)
+        self.assertEqual(resolved['CONFIGURATION'],
+                         'tests.settings.lazy.LazyConfiguration')
+        for name in ('LAZY_VALUE', 'COMPUTED_SETTING', 'METHOD_VALUE'):
+            self.assertNotIn(name, resolved)
+            self.assertIn(name, dir(lazy))
+
+        self.assertEqual(lazy.COMPUTED_SETTING, ['LAZY', 'plain'])
+        self.assertIn('COMPUTED_SETTING', resolved)
+        self.assertEqual(lazy.LAZY_VALUE, 'lazy')
+        self.assertEqual(type(lazy.LAZY_VALUE), str)
+        self.assertEqual(lazy.METHOD_VALUE, 'from environ')
+
+        with self.assertRaises(ValueError) as cm:
+            lazy.BROKEN_VALUE
+        self.assertIn("Couldn't setup setting 'BROKEN_VALUE' of "
+                      "configuration 'tests.settings.lazy.LazyConfiguration'",
+                      cm.exception.args[0])
+        with self.assertRaises(ImproperlyConfigured) as cm:
+            lazy.BROKEN_METHOD
+        self.assertIn("'BROKEN_METHOD'", str(cm.exception))
+        with self.assertRaises(AttributeError):
+            lazy.NON_EXISTING_SETTING
+
+    def test_attribute_access(self):
+        from configurations import Configuration
+        from configurations.base import setup_deferred
+
+        class Eager(Configuration):
+            pass
+
+        class Lazy(Configuration):
+            LAZY_SETTINGS = True
+
+        class Prefetched(Eager):
+            pass
+
+        # only configurations leaving values for later check the attributes
+        self.assertIs(Eager.__getattribute__, object.__getattribute__)
+        self.assertIs(Lazy.__getattribute__, setup_deferred)
+        Prefetched.PREFETCH_VALUES = True
+        self.assertIs(Prefetched.__getattribute__, setup_deferred)
+        self.assertIs(Eager.__getattribute__, object.__getattribute__)
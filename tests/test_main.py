@@ -1,13 +1,15 @@
+import importlib.util
 import os
 import subprocess
 import sys
+from importlib.machinery import SourceFileLoader
 
 from django.test import TestCase
 from django.core.exceptions import ImproperlyConfigured
 
-from unittest.mock import patch
+from unittest.mock import PropertyMock, patch
 
-from configurations.importer import ConfigurationFinder
+from configurations.importer import ConfigurationFinder, ConfigurationLoader
 
 ROOT_DIR = os.path.dirname(os.path.dirname(__file__))
 TEST_PROJECT_DIR = os.path.join(ROOT_DIR, 'test_project')
@@ -63,6 +65,185 @@ class MainTests(TestCase):
         self.assertEqual(TestWithDefaultSetExplicitely.DEFAULT_AUTO_FIELD,
                          "django.db.models.BigAutoField")
 
+    def test_parent_attributes_cache(self):
+        from configurations.base import (Configuration,
+                                         cached_uppercase_attributes)
+
+        class Parent(Configuration):
+            SETTING = 1
+
+        attributes = cached_uppercase_attributes(Parent)
+        self.assertIs(cached_uppercase_attributes(Parent), attributes)
+        self.assertEqual(attributes['SETTING'], 1)
+
+        class Child(Parent):
+            pass
+
+        Parent.SETTING = 2
+        self.assertEqual(cached_uppercase_attributes(Parent)['SETTING'], 2)
+        self.assertEqual(cached_uppercase_attributes(Child)['SETTING'], 1)
+
+        class GrandChild(Child):
+            pass
+
+        self.assertEqual(GrandChild.SETTING, 1)
+        del Child.SETTING
+        self.assertEqual(cached_uppercase_attributes(GrandChild)['SETTING'], 1)
+        self.assertEqual(cached_uppercase_attributes(Child)['SETTING'], 2)
+
+    def test_values_registry(self):
+        from configurations import Configuration, pristinemethod, values
+
+        class Mixin:
+            MIXIN_VALUE = values.Value('mixin')
+
+        for shared in (False, True):
+            class Parent(Configuration):
+                SHARED_DEFAULTS = shared
+                PARENT_VALUE = values.Value('parent')
+                OVERRIDDEN = values.Value('parent')
+
+                @property
+                def PROPERTY(self):
+                    return 1
+
+            class Child(Mixin, Parent):
+                CHILD_VALUE = values.IntegerValue(1)
+                OVERRIDDEN = 'child'
+
+                def METHOD(self):
+                    return 2
+
+                @pristinemethod
+                def PRISTINE():
+                    return 3
+
+            self.assertEqual(list(Child.values()),
+                             ['CHILD_VALUE', 'MIXIN_VALUE', 'PARENT_VALUE'])
+            self.assertEqual(list(Child.computed_settings()),
+                             ['METHOD', 'PROPERTY'])
+            self.assertEqual(list(Parent.values()),
+                             ['OVERRIDDEN', 'PARENT_VALUE'])
+
+            Child.LATE_VALUE = values.Value('late')
+            Child.METHOD = 'no longer computed'
+            self.assertIn('LATE_VALUE', Child.values())
+            self.assertEqual(list(Child.computed_settings()), ['PROPERTY'])
+
+            late_value = Child.LATE_VALUE
+            Child.setup()
+            self.assertEqual(Child._pending_values(), {})
+            # values that have been set up are still listed
+            self.assertEqual(list(Child.values()),
+                             ['CHILD_VALUE', 'LATE_VALUE', 'MIXIN_VALUE',
+                              'PARENT_VALUE'])
+            self.assertIs(Child.values()['LATE_VALUE'], late_value)
+            self.assertEqual(Child.PARENT_VALUE, 'parent')
+            self.assertEqual(Child.LATE_VALUE, 'late')
+
+    def test_drop_values(self):
+        from configurations import Configuration, values
+
+        class Parent(Configuration):
+            PARENT_VALUE = values.Value('parent')
+            OVERRIDDEN = values.Value('parent')
+
+        class Child(Parent):
+            CHILD_VALUE = values.IntegerValue(1)
+            OVERRIDDEN = 'child'
+
+        Child.setup()
+        Child.drop_values()
+        self.assertEqual(vars(Parent)['PARENT_VALUE'], 'parent')
+        self.assertEqual(vars(Child)['CHILD_VALUE'], 1)
+        # values that were never set up are kept
+        self.assertIsInstance(vars(Parent)['OVERRIDDEN'], values.Value)
+        self.assertEqual(list(Parent.values()), ['OVERRIDDEN'])
+
+    def test_computed_settings_evaluated_once(self):
+        from configurations import Configuration, values
+        from configurations.base import computed_dependencies
+
+        calls = []
+
+        class Computed(Configuration):
+            MEMOIZE_COMPUTED = True
+
+            BASE_DIR = '/srv'
+            NAME = values.Value('app')
+
+            @property
+            def STATIC_ROOT(self):
+                calls.append('STATIC_ROOT')
+                return f'{self.BASE_DIR}/{self.NAME}/static'
+
+            @property
+            def STATICFILES_DIRS(self):
+                calls.append('STATICFILES_DIRS')
+                return [self.STATIC_ROOT, self.MEDIA_ROOT()]
+
+            def MEDIA_ROOT(self):
+                calls.append('MEDIA_ROOT')
+                return f'{self.STATIC_ROOT}/media'
+
+        Computed.setup()
+        obj = Computed()
+        self.assertEqual(obj.STATICFILES_DIRS,
+                         ['/srv/app/static', '/srv/app/static/media'])
+        self.assertEqual(obj.MEDIA_ROOT(), '/srv/app/static/media')
+        self.assertEqual(obj.STATIC_ROOT, '/srv/app/static')
+        self.assertEqual(calls, ['STATICFILES_DIRS', 'STATIC_ROOT',
+                                 'MEDIA_ROOT'])
+        self.assertEqual(computed_dependencies(Computed), {
+            'STATICFILES_DIRS': {'STATIC_ROOT', 'MEDIA_ROOT'},
+            'STATIC_ROOT': {'BASE_DIR', 'NAME'},
+            'MEDIA_ROOT': {'STATIC_ROOT'},
+        })
+
+    def test_computed_settings_not_memoized(self):
+        from configurations import Configuration
+
+        class Computed(Configuration):
+            def ITEMS(self):
+                return []
+
+            @property
+            def FIRST(self):
+                items = self.ITEMS()
+                items.append(1)
+                return items
+
+            @property
+            def SECOND(self):
+                items = self.ITEMS()
+                items.append(2)
+                return items
+
+        obj = Computed()
+        # each access gets a new result, which may be changed safely
+        self.assertEqual(obj.FIRST, [1])
+        self.assertEqual(obj.SECOND, [2])
+        self.assertEqual(obj.ITEMS(), [])
+
+    def test_computed_settings_cycle(self):
+        from configurations import Configuration
+
+        class Cycle(Configuration):
+            @property
+            def FIRST(self):
+                return self.SECOND
+
+            @property
+            def SECOND(self):
+                return self.THIRD()
+
+            def THIRD(self):
+                return self.FIRST
+
+        with self.assertRaisesRegex(ImproperlyConfigured,
+                                    'FIRST -> SECOND -> THIRD -> FIRST'):
+            Cycle().FIRST
+
     def test_repr(self):
         from tests.settings.main import Test
         self.assertEqual(repr(Test),
@@ -79,6 +260,65 @@ class MainTests(TestCase):
             repr(finder),
             "<ConfigurationFinder for 'tests.settings.main.Test'>")
 
+    @patch.dict(os.environ, clear=True,
+                DJANGO_SETTINGS_MODULE='tests.settings.main',
+                DJANGO_CONFIGURATION='Test')
+    def test_finder_follows_environment(self):
+        finder = ConfigurationFinder()
+        self.assertIsNone(finder.find_spec('tests.settings.other'))
+        os.environ['DJANGO_SETTINGS_MODULE'] = 'tests.settings.other'
+        self.assertEqual(finder.module, 'tests.settings.other')
+        del os.environ['DJANGO_SETTINGS_MODULE']
+        self.assertIsNone(finder.module)
+        self.assertIsNone(finder.find_spec('tests.settings.main'))
+
+    @patch.dict(os.environ, clear=True,
+                DJANGO_SETTINGS_MODULE='tests.settings.main',
+                DJANGO_CONFIGURATION='Test')
+    def test_settled_finder(self):
+        finder = ConfigurationFinder(settle=True)
+        path = importlib.import_module('tests.settings').__path__
+        spec = finder.find_spec('tests.settings.main', path)
+        self.assertIsInstance(spec.loader, ConfigurationLoader)
+        os.environ['DJANGO_SETTINGS_MODULE'] = 'tests.settings.other'
+        with patch.object(ConfigurationFinder, 'module',
+                          new_callable=PropertyMock) as module:
+            self.assertIsNone(finder.find_spec('tests.settings.other'))
+            self.assertIsNone(finder.find_spec('tests.other'))
+            # reloading the settings module
+            spec = finder.find_spec('tests.settings.main', path)
+        module.assert_not_called()
+        self.assertIsInstance(spec.loader, ConfigurationLoader)
+
+    @patch.dict(os.environ, clear=True,
+                DJANGO_SETTINGS_MODULE='tests.settings.cache',
+                DJANGO_CONFIGURATION='CachedConfiguration')
+    def test_loader_reload(self):
+        finder = ConfigurationFinder()
+        path = importlib.import_module('tests.settings').__path__
+        spec = finder.find_spec('tests.settings.cache', path)
+        loader = spec.loader
+        self.assertIsInstance(loader, ConfigurationLoader)
+        self.assertIs(type(loader.loader), SourceFileLoader)
+        self.assertIn('class CachedConfiguration',
+                      loader.get_source('tests.settings.cache'))
+        module = importlib.util.module_from_spec(spec)
+        loader.exec_module(module)
+        cls = module.CachedConfiguration
+        self.assertEqual(module.CACHED_VALUE, 'default')
+
+        # reloading sets up the module again, resetting changed settings
+        self.assertIs(finder.find_spec('tests.settings.cache', path).loader,
+                      loader)
+        module.CACHED_VALUE = 'mutated'
+        loader.exec_module(module)
+        self.assertIsNot(module.CachedConfiguration, cls)
+        self.assertEqual(module.CACHED_VALUE, 'default')
+
+        os.environ['DJANGO_CACHED_VALUE'] = 'changed'
+        loader.exec_module(module)
+        self.assertEqual(module.CACHED_VALUE, 'changed')
+
     @patch.dict(os.environ, clear=True,
                 DJANGO_SETTINGS_MODULE='tests.settings.inheritance',
                 DJANGO_CONFIGURATION='Inheritance')
@@ -0,0 +1,93 @@
+import io
+import os
+import threading
+
+from django.test import TestCase
+
+from unittest.mock import patch
+
+from configurations import Configuration, prefetch, profiler, values
+
+from .helpers import load_settings
+
+
+class PrefetchTests(TestCase):
+
+    def tearDown(self):
+        profiler.disable()
+
+    @patch.dict(os.environ, clear=True,
+                DJANGO_SETTINGS_MODULE='tests.settings.prefetch',
+                DJANGO_CONFIGURATION='Prefetch',
+                DJANGO_FIRST='1', DJANGO_SECOND='2', DJANGO_THIRD='3')
+    def test_loader(self):
+        profile = profiler.enable()
+        module = load_settings('tests.settings.prefetch')
+        # the values wait for each other, so they were set up at once
+        self.assertFalse(module.barrier.broken)
+        self.assertEqual(module.ALL, ['1', '2', '3'])
+        self.assertEqual(module.HANDLERS, ['logging.StreamHandler'])
+        self.assertNotIn(threading.current_thread().name, module.threads)
+        self.assertEqual(len(module.threads), 3)
+
+        steps = {entry.name for entry in profile.sorted_entries()
+                 if entry.kind == 'prefetch'}
+        self.assertEqual(steps, {'FIRST', 'SECOND', 'THIRD'})
+        self.assertGreater(profile.saved, 0)
+        stream = io.StringIO()
+        profile.report(stream=stream)
+        self.assertIn('Saved by setting up values in the background',
+                      stream.getvalue())
+
+    @patch.dict(os.environ, clear=True)
+    def test_error(self):
+
+        class Broken(Configuration):
+            PREFETCH_VALUES = True
+            REQUIRED = values.Value(environ_required=True)
+
+        prefetch.start(Broken)
+        Broken.setup()
+        # the error of the background thread is raised when joined
+        with self.assertRaises(ValueError) as error:
+            Broken().REQUIRED
+        self.assertIn('DJANGO_REQUIRED', str(error.exception))
+
+    @patch.dict(os.environ, clear=True, DJANGO_BLOCKING='blocking')
+    def test_flight(self):
+        started = threading.Event()
+        release = threading.Event()
+
+        class BlockingValue(values.Value):
+            def to_python(self, value):
+                started.set()
+                release.wait(timeout=5)
+                return value
+
+        class Blocking(Configuration):
+            PREFETCH_VALUES = True
+            BLOCKING = BlockingValue(environ_required=True)
+
+        value = vars(Blocking)['BLOCKING']
+        prefetch.start(Blocking)
+        self.assertTrue(started.wait(timeout=5))
+        # threads reading the value wait for the background thread
+        self.assertIn(id(value), values.setting_up)
+        release.set()
+        Blocking.setup()
+        self.assertEqual(Blocking().BLOCKING, 'blocking')
+        self.assertEqual(Blocking().BLOCKING, 'blocking')
+        self.assertNotIn(id(value), values.setting_up)
+        self.assertEqual(prefetch.prefetching[Blocking].pending, set())
+
+    def test_excluded(self):
+
+        class Excluded(Configuration):
+            PREFETCH_VALUES = True
+            INCLUDED = values.Value('included')
+            EXCLUDED = values.Value('excluded', prefetch=False)
+            HANDLERS = values.BackendsValue(['logging.StreamHandler'])
+
+        self.assertEqual(set(prefetch.start(Excluded).futures), {'INCLUDED'})
+        Excluded.setup()
+        self.assertEqual(Excluded().INCLUDED, 'included')
@@ -0,0 +1,71 @@
+import gc
+import os
+import subprocess
+import sys
+import types
+
+from django.test import TestCase
+
+from unittest.mock import patch
+
+from configurations import gunicorn, prefork, profiler, values
+
+from .helpers import load_settings
+
+
+class PreforkTests(TestCase):
+
+    def tearDown(self):
+        profiler.disable()
+
+    def test_warm_up(self):
+        profile = profiler.enable()
+        prefork.warm_up()
+        steps = {entry.name for entry in profile.sorted_entries()
+                 if entry.kind == 'warm_up'}
+        self.assertEqual(steps, {'urls', 'templates', 'translations'})
+
+    def test_freeze(self):
+        self.addCleanup(gc.unfreeze)
+        prefork.freeze()
+        self.assertGreater(gc.get_freeze_count(), 0)
+
+    def test_entry_point(self):
+        output = subprocess.check_output(
+            [sys.executable, '-c',
+             'import gc, configurations.wsgi_prefork as wsgi; '
+             'print(callable(wsgi.application), gc.get_freeze_count() > 0)'],
+            env=os.environ).decode('utf-8')
+        self.assertEqual(output.split(), ['True', 'True'])
+
+    def test_process_memory(self):
+        memory = profiler.process_memory()
+        if memory is None:
+            self.skipTest('/proc/self/smaps_rollup is not available')
+        self.assertGreater(memory['Rss'], 0)
+        self.assertIn('Private_Dirty', memory)
+
+    @patch.dict(os.environ, clear=True,
+                DJANGO_SETTINGS_MODULE='tests.settings.refresh',
+                DJANGO_CONFIGURATION='Refresh')
+    def test_after_fork(self):
+        module = load_settings('tests.settings.refresh')
+        self.assertEqual(module.CACHE_PREFIX, 'name-0')
+
+        # only the per-worker values are set up again
+        os.environ['DJANGO_NAME'] = 'changed'
+        gunicorn.post_fork(None, types.SimpleNamespace(age=3))
+        self.assertEqual(os.environ['DJANGO_WORKER_ID'], '3')
+        self.assertEqual(module.WORKER_ID, 3)
+        self.assertEqual(module.CACHE_PREFIX, 'name-3')
+        self.assertEqual(module.NAME, 'name')
+
+        module.Refresh.drop_values()
+        prefork.after_fork(4)
+        self.assertEqual(module.CACHE_PREFIX, 'name-4')
+
+    def test_per_worker_value(self):
+        value = values.IntegerValue(1, environ_name='WORKER', per_worker=True)
+        self.assertIsInstance(value, values.IntegerValue)
+        self.assertTrue(value.per_worker)
+        self.assertNotIn('per_worker', vars(values.IntegerValue(1)))
@@ -0,0 +1,84 @@
+import io
+import os
+import subprocess
+import sys
+import types
+
+from django.test import TestCase
+
+from unittest.mock import patch
+
+from configurations import Configuration, profiler, values
+
+
+class ProfilerTests(TestCase):
+
+    def tearDown(self):
+        profiler.disable()
+
+    def test_inactive(self):
+        self.assertIsNone(profiler.active())
+        with profiler.measure('value', 'NAME'):
+            pass
+        stream = io.StringIO()
+        profiler.report(stream=stream)
+        self.assertEqual(stream.getvalue(), '')
+
+    @patch.dict(os.environ, clear=True, DJANGO_PROFILED_VALUE='1')
+    def test_values(self):
+        profile = profiler.enable()
+
+        class Profiled(Configuration):
+            PROFILED_VALUE = values.IntegerValue(0)
+            DEFAULT_VALUE = values.Value('default')
+
+        Profiled.setup()
+        entries = {(entry.kind, entry.name): entry
+                   for entry in profile.sorted_entries()}
+        self.assertEqual(entries['class', f'{__name__}.Profiled'].calls, 1)
+        entry = entries['to_python', 'PROFILED_VALUE']
+        self.assertEqual(entry.environ_name, 'DJANGO_PROFILED_VALUE')
+        self.assertEqual(entry.value_class, 'IntegerValue')
+        self.assertIn(('value', 'DEFAULT_VALUE'), entries)
+        self.assertNotIn(('to_python', 'DEFAULT_VALUE'), entries)
+
+        stream = io.StringIO()
+        profile.report(stream=stream, limit=2)
+        lines = stream.getvalue().splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertEqual(lines[0].split(),
+                         ['ms', 'calls', 'kind', 'name', 'environ', 'class'])
+
+    def test_memory(self):
+        module = types.ModuleType('settings')
+        module.LARGE = ['x' * 1000, 'y' * 1000]
+        module.SHARED = module.LARGE
+        module.lowercase = 'x' * 10000
+        sizes = profiler.settings_footprint(module)
+        self.assertEqual(list(sizes), ['LARGE', 'SHARED'])
+        self.assertGreater(sizes['LARGE'], 2000)
+        self.assertLess(sizes['SHARED'], 100)
+
+        value = values.Value('default', late_binding=True)
+        count, size = profiler.values_footprint()
+        self.assertGreaterEqual(count, 1)
+        self.assertGreater(size, 0)
+
+        stream = io.StringIO()
+        profiler.report_memory(module, stream=stream)
+        self.assertIn('2 settings', stream.getvalue())
+        self.assertIn('Value objects alive', stream.getvalue())
+        del value
+
+    def test_profile_command(self):
+        env = dict(os.environ, DJANGO_CACHED_VALUE='environ')
+        env.pop('DJANGO_CONFIGURATION_CACHE', None)
+        output = subprocess.check_output(
+            [sys.executable, '-m', 'configurations', 'profile',
+             '--settings=tests.settings.cache',
+             '--configuration=CachedConfiguration'], env=env).decode('utf-8')
+        self.assertIn('module      tests.settings.cache', output)
+        self.assertIn('DJANGO_CACHED_VALUE', output)
+        for kind in ('class', 'pre_setup', 'setup', 'post_setup',
+                     'to_python', 'setting'):
+            self.assertIn(f'  {kind}  ', output)
@@ -0,0 +1,120 @@
+import os
+import tempfile
+
+from django.core.exceptions import ImproperlyConfigured
+from django.conf import settings
+from django.test import TestCase, override_settings
+
+from unittest.mock import patch
+
+from configurations import Configuration
+from configurations.base import computed_dependencies
+from configurations.signals import settings_refreshed
+
+from .helpers import load_settings
+
+
+class RefreshTests(TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.dotenv = os.path.join(directory.name, '.env')
+        self.write_dotenv('DJANGO_PORT=8001\n')
+
+    def write_dotenv(self, content):
+        with open(self.dotenv, 'w') as fp:
+            fp.write(content)
+
+    @patch.dict(os.environ, clear=True,
+                DJANGO_SETTINGS_MODULE='tests.settings.refresh',
+                DJANGO_CONFIGURATION='Refresh')
+    def test_refresh(self):
+        os.environ['REFRESH_DOTENV'] = self.dotenv
+        module = load_settings('tests.settings.refresh')
+        cls = module.Refresh
+        self.assertEqual(list(cls.values()), ['NAME', 'PORT', 'WORKER_ID'])
+        self.assertEqual(module.URL, 'http://name:8001/')
+        self.assertEqual(module.computed, ['UNRELATED'])
+
+        received = []
+
+        def receiver(sender, changes, **kwargs):
+            received.append((sender, changes))
+
+        settings_refreshed.connect(receiver)
+        self.addCleanup(settings_refreshed.disconnect, receiver)
+
+        self.assertEqual(cls.refresh(), {})
+        self.assertEqual(received, [])
+
+        self.write_dotenv('DJANGO_PORT=10001\n')
+        changes = cls.refresh()
+        self.assertEqual(changes, {
+            'PORT': (8001, 10001),
+            'ADDRESS': ('name:8001', 'name:10001'),
+            'URL': ('http://name:8001/', 'http://name:10001/'),
+        })
+        self.assertEqual(received, [(cls, changes)])
+        self.assertEqual(module.URL, 'http://name:10001/')
+        self.assertEqual(os.environ['DJANGO_PORT'], '10001')
+
+        os.environ['DJANGO_NAME'] = 'host'
+        with override_settings(SETTINGS_MODULE='tests.settings.refresh'):
+            self.assertEqual(list(cls.refresh()),
+                             ['ADDRESS', 'CACHE_PREFIX', 'NAME', 'URL'])
+            self.assertEqual(settings.URL, 'http://host:10001/')
+        self.assertEqual(module.URL, 'http://host:10001/')
+
+        # variables set otherwise take precedence over the .env file
+        os.environ['DJANGO_PORT'] = '9000'
+        self.write_dotenv('DJANGO_PORT=100001\n')
+        self.assertEqual(cls.refresh()['PORT'], (10001, 9000))
+        del os.environ['DJANGO_PORT']
+        self.assertEqual(cls.refresh()['PORT'], (9000, 100001))
+
+        self.write_dotenv('')
+        self.assertEqual(cls.refresh()['PORT'], (100001, 8000))
+        self.assertNotIn('DJANGO_PORT', os.environ)
+        self.assertEqual(module.computed, ['UNRELATED'])
+
+    @patch.dict(os.environ, clear=True,
+                DJANGO_SETTINGS_MODULE='tests.settings.refresh',
+                DJANGO_CONFIGURATION='Refresh')
+    def test_refresh_unknown_setting(self):
+        cls = load_settings('tests.settings.refresh').Refresh
+        for name in ('MISSING', 'ADDRESS'):
+            with self.assertRaises(ImproperlyConfigured) as cm:
+                cls.refresh(['PORT', name])
+            self.assertIn(f"setting {name!r} of <Configuration "
+                          f"'tests.settings.refresh.Refresh'>",
+                          str(cm.exception))
+
+    def test_inherited_dependencies(self):
+        class Parent(Configuration):
+            NAME = 'parent'
+            PORT = 80
+
+            @property
+            def ADDRESS(self):
+                return f'{self.NAME}:{self.port()}'
+
+            def port(self):
+                return self.PORT
+
+        class Child(Parent):
+            SCHEME = 'http'
+
+            @property
+            def ADDRESS(self):
+                return f'{type(self).SCHEME}://{super().ADDRESS}'
+
+        self.assertEqual(computed_dependencies(Child),
+                         {'ADDRESS': {'SCHEME', 'NAME', 'PORT'}})
+
+    def test_not_set_up(self):
+        class NotSetUp(Configuration):
+            pass
+
+        with self.assertRaises(ImproperlyConfigured):
+            NotSetUp.refresh()
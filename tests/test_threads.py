@@ -0,0 +1,136 @@
+import os
+import threading
+import time
+import types
+from concurrent.futures import ThreadPoolExecutor
+
+from django.test import TestCase
+
+from unittest.mock import patch
+
+from configurations import Configuration, values
+from configurations.importer import LazySettings
+from configurations.utils import SingleFlight
+
+threads = 32
+
+
+class SlowValue(values.Value):
+    """
+    Counts its calls of ``to_python``, which gives other threads the time
+    to try setting it up as well.
+    """
+    def __init__(self, *args, **kwargs):
+        self.calls = []
+        super().__init__(*args, **kwargs)
+
+    def to_python(self, value):
+        self.calls.append(threading.get_ident())
+        time.sleep(0.05)
+        return [value]
+
+
+def run_concurrently(function):
+    """
+    Calls the function in many threads at the same time, returning the
+    results.
+    """
+    barrier = threading.Barrier(threads)
+
+    def call():
+        barrier.wait()
+        return function()
+
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        futures = [executor.submit(call) for _ in range(threads)]
+        return [future.result() for future in futures]
+
+
+@patch.dict(os.environ, clear=True, DJANGO_SLOW='environ')
+class ThreadTests(TestCase):
+
+    def assertSingleResult(self, results, expected):
+        self.assertEqual(len(results), threads)
+        self.assertEqual(results[0], expected)
+        # all threads got the very same object
+        self.assertEqual({id(result) for result in results}, {id(results[0])})
+
+    def test_value(self):
+        value = SlowValue(environ_name='SLOW', late_binding=True)
+        results = run_concurrently(lambda: value.value)
+        self.assertEqual(len(value.calls), 1)
+        self.assertSingleResult(results, ['environ'])
+        self.assertNotIn(id(value), values.setting_up)
+
+    def test_value_error(self):
+        value = values.PathValue(environ_name='SLOW', late_binding=True)
+        errors = []
+
+        def read():
+            try:
+                return value.value
+            except ValueError as err:
+                errors.append(err)
+
+        run_concurrently(read)
+        # every thread tried again since no value was published
+        self.assertEqual(len(errors), threads)
+        self.assertFalse(hasattr(value, '_value'))
+
+    def test_lazy_configuration(self):
+
+        class Lazy(Configuration):
+            LAZY_SETTINGS = True
+            SLOW = SlowValue('default')
+
+        value = Lazy.SLOW
+        Lazy.setup()
+        obj = Lazy()
+        results = run_concurrently(lambda: obj.SLOW)
+        self.assertEqual(len(value.calls), 1)
+        self.assertSingleResult(results, ['environ'])
+
+    def test_lazy_settings(self):
+        computed = []
+
+        class Lazy(Configuration):
+            LAZY_SETTINGS = True
+            SLOW = SlowValue('default')
+
+            @property
+            def COMPUTED(self):
+                computed.append(threading.get_ident())
+                return self.SLOW + ['computed']
+
+        value = Lazy.SLOW
+        Lazy.setup()
+        module = types.ModuleType('lazy_settings')
+        LazySettings(module, Lazy(), 'Lazy', values.Environment(
+            os.environ)).install()
+        results = run_concurrently(lambda: (module.COMPUTED, module.SLOW))
+        self.assertEqual(len(value.calls), 1)
+        self.assertEqual(len(computed), 1)
+        self.assertSingleResult([slow for _, slow in results], ['environ'])
+        self.assertSingleResult([computed for computed, _ in results],
+                                ['environ', 'computed'])
+
+    def test_exclusive(self):
+        flights = SingleFlight()
+        events = []
+        started = threading.Event()
+
+        def work():
+            with flights('key'):
+                started.set()
+                time.sleep(0.05)
+                events.append('work')
+
+        thread = threading.Thread(target=work)
+        thread.start()
+        started.wait()
+        with flights.exclusive():
+            # waits for the work in the other thread to finish
+            events.append('exclusive')
+        thread.join()
+        self.assertEqual(events, ['work', 'exclusive'])
+        self.assertNotIn('key', flights)
@@ -1,5 +1,8 @@
+import asyncio
 import decimal
 import os
+import threading
+import time
 from contextlib import contextmanager
 
 from django import VERSION as DJANGO_VERSION
@@ -8,6 +11,7 @@ from django.core.exceptions import ImproperlyConfigured
 
 from unittest.mock import patch
 
+from configurations import values
 from configurations.values import (Value, BooleanValue, IntegerValue,
                                    FloatValue, DecimalValue, ListValue,
                                    TupleValue, SingleNestedTupleValue,
@@ -59,6 +63,81 @@ class ValueTests(TestCase):
 
             self.assertEqual(repr(value), repr('override'))
 
+    def test_value_instance_attributes(self):
+        # only attributes differing from the class take up space
+        self.assertEqual(vars(Value('default')), {})
+        self.assertEqual(vars(IntegerValue(1)), {})
+        value = ListValue(separator=':', environ_name='LIST',
+                          environ_required=True, late_binding=True)
+        self.assertEqual(value.separator, ':')
+        self.assertEqual(value.environ_name, 'LIST')
+        self.assertTrue(value.environ_required)
+        self.assertEqual(ListValue().separator, ',')
+        self.assertIsNone(ListValue().environ_name)
+
+    def test_value_published_after_setup(self):
+        published = []
+
+        class CheckedValue(Value):
+            def setup(self, name):
+                value = super().setup(name)
+                published.append(hasattr(self, '_value'))
+                return value
+
+        value = CheckedValue(environ_name='TEST', late_binding=True)
+        with env(DJANGO_TEST='checked'):
+            self.assertEqual(value.value, 'checked')
+        self.assertEqual(published, [False])
+        self.assertEqual(value._value, 'checked')
+
+        # a value rejected by a subclass is never published
+        value = SecretValue(environ_name='TEST', late_binding=True)
+        with env(DJANGO_TEST=''):
+            self.assertRaises(ValueError, value.setup, 'TEST')
+        self.assertFalse(hasattr(value, '_value'))
+
+    def test_value_memoized(self):
+        value = Value(environ_name='TEST', late_binding=True)
+        with env(DJANGO_TEST='first'):
+            with patch.object(Value, 'setup', wraps=value.setup) as setup:
+                self.assertEqual(value.value, 'first')
+                self.assertEqual(value, 'first')
+                self.assertEqual(str(value), 'first')
+            self.assertEqual(setup.call_count, 1)
+        with env(DJANGO_TEST='second'):
+            self.assertEqual(value.value, 'first')
+            value.reset()
+            self.assertEqual(value.value, 'second')
+            value.reset()
+            value.reset()
+        self.assertEqual(Value('default', late_binding=True).value, 'default')
+
+    def test_value_setup_once_across_threads(self):
+        calls = []
+        barrier = threading.Barrier(8)
+
+        class SlowValue(Value):
+            def to_python(self, value):
+                calls.append(value)
+                time.sleep(0.01)
+                return value
+
+        value = SlowValue(environ_name='TEST', late_binding=True)
+
+        def read():
+            barrier.wait()
+            results.append(value.value)
+
+        results = []
+        with env(DJANGO_TEST='shared'):
+            threads = [threading.Thread(target=read) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(results, ['shared'] * 8)
+        self.assertEqual(calls, ['shared'])
+
     def test_value_truthy(self):
         value = Value('default')
         self.assertTrue(bool(value))
@@ -163,6 +242,46 @@ class ValueTests(TestCase):
     def test_failing_caster(self):
         self.assertRaises(ImproperlyConfigured, FailingCasterValue)
 
+    def test_caster_imported_on_use(self):
+        with patch.dict(values._imported, clear=True):
+            value = DatabaseURLValue()
+            self.assertNotIn('dj_database_url.parse', values._imported)
+            with env(DATABASE_URL='sqlite://'):
+                value.setup('DATABASE_URL')
+            self.assertIn('dj_database_url.parse', values._imported)
+
+        # also with a default URL, converted when it's used
+        with patch.dict(values._imported, clear=True):
+            database = DatabaseURLValue('sqlite:///db.sqlite3')
+            cache = CacheURLValue('locmem://')
+            self.assertEqual(values._imported, {})
+            with env():
+                self.assertEqual(
+                    database.setup('DATABASE_URL')['default']['NAME'],
+                    'db.sqlite3')
+                self.assertEqual(
+                    cache.setup('CACHE_URL')['default']['BACKEND'],
+                    'django.core.cache.backends.locmem.LocMemCache')
+            self.assertIn('dj_database_url.parse', values._imported)
+            self.assertIn('django_cache_url.parse', values._imported)
+
+        class MissingCasterValue(CastingMixin, Value):
+            caster = 'configurations.values.missing_caster'
+
+        value = MissingCasterValue()
+        with env(DJANGO_TEST='value'):
+            self.assertRaises(ImproperlyConfigured, value.setup, 'TEST')
+
+    def test_caster_argument_names_cached(self):
+        def caster(value, engine=None):
+            return value, engine
+
+        with patch.dict(values._argument_names, clear=True):
+            for _ in range(2):
+                self.assertEqual(values.argument_names(caster),
+                                 {'value', 'engine'})
+            self.assertEqual(list(values._argument_names), [caster])
+
     def test_list_values_default(self):
         value = ListValue()
         with env(DJANGO_TEST='2,2'):
@@ -480,6 +599,77 @@ class ValueTests(TestCase):
         backends = ['non.existing.Backend']
         self.assertRaises(ValueError, BackendsValue, backends)
 
+    def test_backend_list_value_validated_once(self):
+        backends = ['django.middleware.common.CommonMiddleware'] * 2
+        with patch.object(values, 'validated_backends', set()), \
+                patch('configurations.values.import_string') as import_string:
+            BackendsValue(backends)
+            BackendsValue(backends)
+        self.assertEqual(import_string.call_count, 1)
+
+    def test_backend_list_value_deferred(self):
+        from django.core import checks
+        from configurations.checks import check_backends
+
+        backends = ['django.middleware.common.CommonMiddleware',
+                    'non.existing.Backend']
+        with patch('configurations.checks.deferred_backends', set()), \
+                patch.object(values, 'validated_backends', set()):
+            value = BackendsValue(backends, deferred=True)
+            self.assertEqual(value.default, backends)
+            with env(DJANGO_TEST='also.non.existing.Backend'):
+                value.setup('TEST')
+            self.assertIn(check_backends, checks.registry.registry.registered_checks)
+            errors = check_backends()
+        self.assertEqual([error.id for error in errors],
+                         ['configurations.E001'] * 2)
+        self.assertIn("'also.non.existing.Backend'", errors[0].msg)
+        self.assertIn("'non.existing.Backend'", errors[1].msg)
+
+    def test_resolver(self):
+        from configurations import Configuration
+
+        resolving = []
+        # set once all three resolvers run, created in their event loop
+        running = {}
+
+        async def resolver(name):
+            event = running.setdefault('event', asyncio.Event())
+            resolving.append(name)
+            if len(resolving) == 3:
+                event.set()
+            # times out unless the resolvers run concurrently
+            await asyncio.wait_for(event.wait(), timeout=5)
+            return None if name == 'FALLBACK' else f'{len(name)}'
+
+        class Resolved(Configuration):
+            FIRST = IntegerValue(1, resolver=resolver)
+            SECOND = IntegerValue(2, resolver=resolver)
+            FALLBACK = Value('default', resolver=resolver)
+            ENVIRON = Value('default', resolver=resolver)
+
+        with env(DJANGO_ENVIRON='environ'):
+            Resolved.setup()
+        self.assertEqual(sorted(resolving), ['FALLBACK', 'FIRST', 'SECOND'])
+        self.assertEqual(Resolved.FIRST, 5)
+        self.assertEqual(Resolved.SECOND, 6)
+        self.assertEqual(Resolved.FALLBACK, 'default')
+        self.assertEqual(Resolved.ENVIRON, 'environ')
+
+    def test_resolver_in_event_loop(self):
+        value = Value('default', resolver='os.path.basename',
+                      late_binding=True)
+
+        async def setup():
+            return value.setup('/srv/name')
+
+        with env():
+            self.assertEqual(asyncio.run(setup()), 'name')
+        value.reset()
+        self.assertTrue(value.needs_resolving('/srv/name'))
+        with self.assertRaises(ImproperlyConfigured):
+            Value(resolver='non.existing.resolver')
+
     def test_tuple_value(self):
         value = TupleValue(None)
         self.assertEqual(value.default, ())